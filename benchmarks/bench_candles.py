@@ -0,0 +1,45 @@
+"""
+Candle drawing: six ax.bar calls vs stocklibs.candles collections (Agg backend).
+"""
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from common import synthetic_ohlcv, best_of, report, header
+from stocklibs import candles
+
+def legacy_draw(data, width=0.6):
+    # Implementação anterior do Plotter.plot_candlestick_chart
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax1 = fig.add_subplot()
+    width2 = 0.05
+    up = data[data.Close >= data.Open]
+    down = data[data.Close < data.Open]
+    ax1.bar(up.index, up.Close - up.Open, width, bottom=up.Open, color='g')
+    ax1.bar(up.index, up.High - up.Close, width2, bottom=up.Close, color='g')
+    ax1.bar(up.index, up.Low - up.Open, width2, bottom=up.Open, color='g')
+    ax1.bar(down.index, down.Close - down.Open, width, bottom=down.Open, color='r')
+    ax1.bar(down.index, down.High - down.Open, width2, bottom=down.Open, color='r')
+    ax1.bar(down.index, down.Low - down.Close, width2, bottom=down.Close, color='r')
+    fig.canvas.draw()
+
+def collection_draw(data, width=0.6):
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax1 = fig.add_subplot()
+    candles.draw_candles(ax1, candles.date_positions(data.index), data['Open'], data['High'], data['Low'], data['Close'], width)
+    ax1.xaxis_date()
+    fig.canvas.draw()
+
+def main():
+    header("6x ax.bar", "coleções")
+    for n_bars in (1_000, 10_000, 50_000):
+        data = synthetic_ohlcv(n_bars)
+        repeat = 1 if n_bars > 10_000 else 3
+        baseline = best_of(lambda: legacy_draw(data), repeat=repeat)
+        candidate = best_of(lambda: collection_draw(data), repeat=repeat)
+        report(f"{n_bars} barras, criar + desenhar", baseline, candidate)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Multi-ticker download: serial stockdata.fetch loop vs stockdata.fetch_many.
+
+The network is simulated by a provider that sleeps a fixed latency per
+request, so the numbers show how much of the wait the worker pool hides.
+"""
+import time
+import tempfile
+from common import synthetic_ohlcv, report, header
+from stocklibs import stockdata
+from stocklibs.providers import Provider
+from stocklibs.history_store import HistoryStore, slice_range
+
+LATENCY = 0.05
+
+class LatencyProvider(Provider):
+    name = 'latency'
+    host = 'bench'
+
+    def __init__(self):
+        self.data = synthetic_ohlcv(2_500)
+
+    def history(self, symbol, start=None, end=None, period=None):
+        time.sleep(LATENCY)
+        return slice_range(self.data, start, end)
+
+def timed(func):
+    stockdata.history_store.invalidate()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    stockdata.set_provider(LatencyProvider())
+    stockdata.history_store = HistoryStore(tempfile.mkdtemp())
+    header("serial", "fetch_many")
+    for n_symbols in (50, 400):
+        symbols = [f"T{i:03d}" for i in range(n_symbols)]
+        baseline = timed(lambda: [stockdata.fetch(symbol, start_date="2020-01-01", end_date="2024-12-31") for symbol in symbols])
+        candidate = timed(lambda: stockdata.fetch_many(symbols, "2020-01-01", "2024-12-31"))
+        report(f"{n_symbols} tickers, {LATENCY * 1000:.0f} ms por requisição", baseline, candidate)
+
+if __name__ == '__main__':
+    main()
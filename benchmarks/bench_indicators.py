@@ -0,0 +1,88 @@
+"""
+Indicator calculation: per-indicator pandas calls vs stocklibs.indicators.
+"""
+import numpy as np
+import pandas as pd
+from common import synthetic_ohlcv, best_of, report, header
+from stocklibs import indicators
+
+SPECS = {
+    'sma': (20,),
+    'ema': (20,),
+    'wma': (20,),
+    'rsi': (14,),
+    'macd': (12, 26, 9),
+    'bollinger': (20,),
+    'stochastic': (14, 3),
+}
+
+# Sobreposições e painéis visíveis ao mesmo tempo que dividem cálculos com as configurações padrão:
+# SMA e Bollinger usam a mesma média de ma_period, e os dois painéis de estocástico o mesmo %K
+PANE_SPECS = (
+    {'sma': (20,)},  # SMA
+    {'bollinger': (20,)},  # Bandas de Bollinger
+    {'stochastic': (14, 3)},  # Estocástico Normal
+    {'stochastic': (14, 3)},  # Estocástico Lento
+)
+
+def legacy_compute(data):
+    # Mesmos cálculos que o Plotter e os helpers calcular_* faziam com pandas
+    close = data['Close']
+    results = {}
+    results['sma'] = close.rolling(window=20).mean()
+    results['ema'] = close.ewm(span=20, adjust=False).mean()
+    results['wma'] = close.rolling(window=20).apply(lambda x: np.average(x, weights=np.arange(len(x), 0, -1)))
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    results['rsi'] = 100 - (100 / (1 + gain / loss))
+    short_ema = close.ewm(span=12, adjust=False).mean()
+    long_ema = close.ewm(span=26, adjust=False).mean()
+    results['macd'] = short_ema - long_ema
+    results['macd_signal'] = results['macd'].ewm(span=9, adjust=False).mean()
+    results['macd_hist'] = results['macd'] - results['macd_signal']
+    middle = close.rolling(window=20).mean()
+    deviation = close.rolling(window=20).std()
+    results['bollinger_mid'] = middle
+    results['bollinger_upper'] = middle + deviation * 2
+    results['bollinger_lower'] = middle - deviation * 2
+    lowest = data['Low'].rolling(window=14).min()
+    highest = data['High'].rolling(window=14).max()
+    results['stochastic_k'] = 100 * ((close - lowest) / (highest - lowest))
+    results['stochastic_d'] = results['stochastic_k'].rolling(window=3).mean()
+    return pd.DataFrame(results)
+
+def flat_window(data, start=1_000, length=20):
+    # Papel sem negócios por alguns pregões: máxima = mínima, então %K divide 0 por 0
+    data = data.copy()
+    price = data['Close'].iloc[start]
+    data.iloc[start:start + length, data.columns.get_indexer(['Open', 'High', 'Low', 'Close'])] = price
+    return data
+
+def check(data):
+    expected = legacy_compute(data)
+    result = indicators.compute_frame(data, SPECS)
+    for column in expected.columns:
+        np.testing.assert_allclose(result[column].to_numpy(), expected[column].to_numpy(), rtol=1e-7, atol=1e-7, err_msg=column)
+
+def main():
+    header()
+    for n_bars in (2_500, 10_000, 50_000):
+        data = synthetic_ohlcv(n_bars)
+        check(data)
+        check(flat_window(data))
+        repeat = 1 if n_bars > 10_000 else 3
+        baseline = best_of(lambda: legacy_compute(data), repeat=repeat)
+        candidate = best_of(lambda: indicators.compute_frame(data, SPECS))
+        report(f"{n_bars} barras, todos os indicadores", baseline, candidate)
+
+        # Um pipeline por painel contra uma única chamada para todos os painéis visíveis
+        combined = {}
+        for specs in PANE_SPECS:
+            combined.update(specs)
+        baseline = best_of(lambda: [indicators.compute_frame(data, specs) for specs in PANE_SPECS])
+        candidate = best_of(lambda: indicators.compute_frame(data, combined))
+        report(f"{n_bars} barras, SMA+Bollinger+2 estoc.", baseline, candidate)
+
+if __name__ == '__main__':
+    main()
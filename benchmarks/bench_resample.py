@@ -0,0 +1,58 @@
+"""
+Multi-day candle aggregation: groupby implementation vs stocklibs.resample.
+"""
+import numpy as np
+import pandas as pd
+from common import synthetic_ohlcv, best_of, report, header
+from stocklibs import resample
+
+def legacy_aggregate(data, candlestick_period):
+    # Implementação anterior do DataFetcher.fetch_stock_data
+    data = data.copy()
+    data['group'] = np.arange(len(data)) // candlestick_period
+    data = pd.DataFrame({
+        'Open': data.groupby('group')['Open'].first(),
+        'High': data.groupby('group')['High'].max(),
+        'Low': data.groupby('group')['Low'].min(),
+        'Close': data.groupby('group')['Close'].last(),
+        'Volume': data.groupby('group')['Volume'].sum(),
+        'Date': data.groupby('group').apply(lambda x: x.index[0])
+    })
+    data.set_index('Date', inplace=True)
+    return data
+
+# Regras do DataFrame.resample equivalentes: semana de segunda a domingo e fim de mês
+# ('M' deixou de ser aceito no pandas 3; 'ME' existe desde o 2.2)
+RESAMPLE_RULES = {
+    'W': 'W-SUN',
+    'M': 'ME' if tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2) else 'M',
+}
+
+def pandas_resample(data, rule):
+    return data.resample(RESAMPLE_RULES[rule]).agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'})
+
+def main():
+    header()
+    for n_bars in (2_500, 10_000, 50_000):
+        data = synthetic_ohlcv(n_bars)
+        for period in (5, 21):
+            expected = legacy_aggregate(data, period)
+            result = resample.aggregate(data, period)
+            np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+            baseline = best_of(lambda: legacy_aggregate(data, period))
+            candidate = best_of(lambda: resample.aggregate(data, period))
+            report(f"{n_bars} barras, {period} dias", baseline, candidate)
+        # resample com fuso quebra nas meias-noites que não existem no horário de verão;
+        # resample.aggregate agrupa pela data local, então a referência usa o índice sem fuso
+        local = data.tz_localize(None)
+        for rule in ('W', 'M'):
+            # resample rotula pelo fim do período e cria linhas vazias para períodos sem pregão
+            expected = pandas_resample(local, rule).dropna(subset=['Open'])
+            result = resample.aggregate(data, rule)
+            np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+            candidate = best_of(lambda: resample.aggregate(data, rule))
+            baseline = best_of(lambda: pandas_resample(local, rule))
+            report(f"{n_bars} barras, calendário {rule} (vs resample)", baseline, candidate)
+
+if __name__ == '__main__':
+    main()
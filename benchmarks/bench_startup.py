@@ -0,0 +1,38 @@
+"""
+Startup time: process start to the first paint of the main window.
+
+Launches main.py with NOVA_STARTUP_EXIT=1, so the application quits right
+after the first paint, and reports the in-process measurement printed by
+FirstPaintTimer next to the wall time of the whole process. Outside Linux
+the in-process measurement starts when main.py is imported rather than at
+process start.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from common import header
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+def launch():
+    env = dict(os.environ, NOVA_STARTUP_EXIT='1')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py')], env=env, cwd=ROOT, capture_output=True, text=True, timeout=120)
+    wall = time.perf_counter() - start
+    match = re.search(r"primeira pintura: (\d+) ms", result.stdout)
+    if match is None:
+        raise RuntimeError(f"main.py não informou o tempo de inicialização:\n{result.stdout}\n{result.stderr}")
+    return int(match.group(1)) / 1000, wall
+
+def main():
+    header("primeira pintura", "processo")
+    runs = [launch() for _ in range(RUNS)]
+    first_paint = min(run[0] for run in runs)
+    wall = min(run[1] for run in runs)
+    print(f"{'janela principal vazia':<40} {first_paint * 1000:>10.2f} ms {wall * 1000:>10.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Run the scripts from the repository root, e.g. ``python benchmarks/bench_resample.py``.
+"""
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+
+# Permite importar stocklibs rodando o script diretamente
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def synthetic_ohlcv(n_bars, seed=0):
+    """
+    Random-walk daily bars on business days, timezone-aware like yfinance.
+    """
+    rng = np.random.default_rng(seed)
+    # Meia-noite cai no buraco do horário de verão em alguns anos antigos; avança para 01:00 como o yfinance
+    index = pd.bdate_range(end="2024-12-31", periods=n_bars).tz_localize("America/Sao_Paulo", nonexistent='shift_forward')
+    close = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.005, n_bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n_bars)))
+    volume = rng.integers(100_000, 10_000_000, n_bars).astype(float)
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
+
+def best_of(func, repeat=5, number=1):
+    """
+    Best wall time in seconds of ``number`` calls, over ``repeat`` runs.
+    """
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+def report(name, baseline, candidate):
+    print(f"{name:<40} {baseline * 1000:>10.2f} ms {candidate * 1000:>10.2f} ms {baseline / candidate:>8.1f}x")
+
+def header(baseline_label="atual", candidate_label="novo"):
+    print(f"{'caso':<40} {baseline_label:>13} {candidate_label:>13} {'ganho':>9}")
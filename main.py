@@ -1,28 +1,24 @@
 import sys
+import time
+STARTED = time.perf_counter()  # Importação do main.py: início da medida da primeira pintura onde o do processo não está disponível
+
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QMenu, QMenuBar, QVBoxLayout, QWidget, QPushButton, QFrame, QInputDialog, QSizePolicy, QMessageBox, QDateEdit, QDialog, QDialogButtonBox, QLabel, QFileDialog, QTableWidget, QTableWidgetItem, QDockWidget
+    QApplication, QMainWindow, QMenu, QMenuBar, QVBoxLayout, QWidget, QPushButton, QFrame, QInputDialog, QSizePolicy, QMessageBox, QDateEdit, QDialog, QDialogButtonBox, QLabel, QFileDialog, QTableWidget, QTableWidgetItem, QDockWidget, QStackedWidget, QLineEdit
 )
 from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt, QThread, Signal, QDate, QTimer
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import pandas as pd
+from PySide6.QtCore import Qt, QThread, Signal, QDate
 from datetime import datetime, date, timedelta
-import numpy as np
-from stocklibs import stockdata
-from stocklibs.stockdata import calculate_macd, calcular_media_movel, calcular_desvio_padrao, calcular_bandas_bollinger, calcular_estocastico_normal, calcular_estocastico_lento
-from stocklibs.metrics import MetricsWindow
-from stocklibs.smart_metrics import SmartMetricsWindow
-from stocklibs.revenue_income_chart import RevenueIncomeChart
-from stocklibs.assets_liabilities_chart import AssetsLiabilitiesChart
+from stocklibs.cache import CandleCache
+from stocklibs.workers import TaskRunner
 from stocklibs.analysis import StockAnalysis
 from stocklibs.assets import styles
 from stocklibs.settings_dialog import SettingsDialog, SettingsManager
-import matplotlib.gridspec as gridspec
-import matplotlib.dates as mdates
-import yfinance as yf
+from stocklibs.startup import FirstPaintTimer
 import os
 
+# matplotlib, pandas, yfinance, o gráfico e as janelas secundárias são importados no primeiro uso,
+# para que a janela principal vazia abra sem carregá-los
+
 # Constantes
 DEFAULT_CANDLESTICK_PERIOD = 1
 DEFAULT_START_DATE = date.today() - timedelta(days=365)
@@ -31,224 +27,88 @@ DEFAULT_END_DATE = date.today()
 class DataFetcher:
     @staticmethod
     def fetch_stock_data(symbol, start_date, end_date, candlestick_period, cache):
-        # Convert QDate to string format if necessary
-        if isinstance(start_date, QDate):
-            start_date = start_date.toString("yyyy-MM-dd")
-        if isinstance(end_date, QDate):
-            end_date = end_date.toString("yyyy-MM-dd")
-
-        cache_key = (symbol, start_date, end_date, candlestick_period)
-        if cache_key in cache:
-            return cache[cache_key]
+        from stocklibs import resample
+        # Convert QDate/date to string format if necessary
+        start_date = DataFetcher._to_date_string(start_date)
+        end_date = DataFetcher._to_date_string(end_date)
+
         try:
-            data = stockdata.fetch(symbol=symbol, start_date=start_date, end_date=end_date)
+            data = DataFetcher._daily_series(symbol, start_date, end_date, cache)
+            return resample.aggregate(data, candlestick_period)
+        except ValueError as e:
+            raise ValueError(f"Erro ao buscar dados para {symbol}: {e}")
+
+    @staticmethod
+    def _daily_series(symbol, start_date, end_date, cache):
+        from stocklibs import stockdata
+        from stocklibs.history_store import slice_range
+        # O cache guarda uma única série diária por ticker; sub-períodos são fatias dela
+        entry = cache.get(symbol)
+        if entry is None or not (entry[0] <= start_date and end_date <= entry[1]):
+            fetch_start, fetch_end = start_date, end_date
+            if entry is not None:
+                # Amplia o período guardado para também cobrir o novo pedido
+                fetch_start, fetch_end = min(start_date, entry[0]), max(end_date, entry[1])
+            data = stockdata.fetch(symbol=symbol, start_date=fetch_start, end_date=fetch_end)
             if data.empty or data.isnull().values.any():
                 raise ValueError(f"Não há dados válidos para {symbol}")
             data = data[['Open', 'High', 'Low', 'Close', 'Volume']].dropna()
             if 'Volume' not in data.columns:
                 raise ValueError("Dados de volume não disponíveis")
-            if candlestick_period > 1:
-                data['group'] = np.arange(len(data)) // candlestick_period
-                data = pd.DataFrame({
-                    'Open': data.groupby('group')['Open'].first(),
-                    'High': data.groupby('group')['High'].max(),
-                    'Low': data.groupby('group')['Low'].min(),
-                    'Close': data.groupby('group')['Close'].last(),
-                    'Volume': data.groupby('group')['Volume'].sum(),
-                    'Date': data.groupby('group').apply(lambda x: x.index[0])
-                })
-                data.set_index('Date', inplace=True)
-            cache[cache_key] = data
-            return data
-        except ValueError as e:
-            raise ValueError(f"Erro ao buscar dados para {symbol}: {e}")
+            entry = (fetch_start, fetch_end, data)
+            cache[symbol] = entry
+
+        data = slice_range(entry[2], start_date, end_date)
+        if data.empty:
+            raise ValueError(f"Não há dados válidos para {symbol}")
+        return data
 
-class Plotter:
     @staticmethod
-    def plot_candlestick_chart(canvas, data, ticker, settings, medias, show_volume, show_ifr, show_macd, show_bandas_bollinger, show_estocastico_normal, show_estocastico_lento, candlestick_period):
-        canvas.figure.clear()
-        canvas.figure.patch.set_facecolor('#252525')  # Set background color
-        if show_ifr:
-            gs = gridspec.GridSpec(2, 1, height_ratios=[3, 1])
-            ax1 = canvas.figure.add_subplot(gs[0])
-            ax2 = canvas.figure.add_subplot(gs[1])
-        elif show_volume:
-            gs = gridspec.GridSpec(2, 1, height_ratios=[3, 1])
-            ax1 = canvas.figure.add_subplot(gs[0])
-            ax3 = canvas.figure.add_subplot(gs[1])
-        elif show_macd:
-            gs = gridspec.GridSpec(2, 1, height_ratios=[3, 1])
-            ax1 = canvas.figure.add_subplot(gs[0])
-            ax4 = canvas.figure.add_subplot(gs[1])
-        elif show_estocastico_normal:
-            gs = gridspec.GridSpec(2, 1, height_ratios=[3, 1])
-            ax1 = canvas.figure.add_subplot(gs[0])
-            ax5 = canvas.figure.add_subplot(gs[1])
-        elif show_estocastico_lento:
-            gs = gridspec.GridSpec(2, 1, height_ratios=[3, 1])
-            ax1 = canvas.figure.add_subplot(gs[0])
-            ax6 = canvas.figure.add_subplot(gs[1])
-        else:
-            gs = gridspec.GridSpec(1, 1)
-            ax1 = canvas.figure.add_subplot(gs[0])
-
-        ax1.set_facecolor('#1e1e1e')  # Set subplot background color
-        ax1.tick_params(axis='x', colors='#d4d4d4')  # Set x-axis tick color
-        ax1.tick_params(axis='y', colors='#d4d4d4')  # Set y-axis tick color
-        ax1.set_title(f"Gráfico de Candlestick para {ticker} (Período: {candlestick_period} {'dia' if candlestick_period == 1 else 'dias'})", color='#d4d4d4')
-        ax1.set_ylabel("Preço", color='#d4d4d4')
-        ax1.spines['bottom'].set_color('#333')
-        ax1.spines['top'].set_color('#333')
-        ax1.spines['right'].set_color('#333')
-        ax1.spines['left'].set_color('#333')
-
-        width = 0.6 * candlestick_period
-        width2 = 0.05 * candlestick_period
-
-        up = data[data.Close >= data.Open]
-        down = data[data.Close < data.Open]
-
-        if show_ifr:
-            delta = data['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=settings.rsi_period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=settings.rsi_period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            ax2.set_facecolor('#1e1e1e')
-            ax2.tick_params(axis='x', colors='#d4d4d4')
-            ax2.tick_params(axis='y', colors='#d4d4d4')
-            ax2.set_title("IFR", color='#d4d4d4')
-            ax2.set_ylabel("Valor do IFR", color='#d4d4d4')
-            ax2.plot(data.index, rsi, color='purple', label='IFR')
-            ax2.axhline(30, color='red', linestyle='--', label='SV')
-            ax2.axhline(70, color='green', linestyle='--', label='SC')
-            ax2.set_ylim(0, 100)
-            ax2.legend(labelcolor='#d4d4d4')
-            ax2.spines['bottom'].set_color('#333')
-            ax2.spines['top'].set_color('#333')
-            ax2.spines['right'].set_color('#333')
-            ax2.spines['left'].set_color('#333')
-        elif show_volume:
-            ax3.set_facecolor('#1e1e1e')
-            ax3.tick_params(axis='x', colors='#d4d4d4')
-            ax3.tick_params(axis='y', colors='#d4d4d4')
-            ax3.set_title("Volume", color='#d4d4d4')
-            ax3.set_ylabel("Volume", color='#d4d4d4')
-            ax3.bar(data.index, data['Volume'], color='b', alpha=0.5)
-            ax3.set_ylim(0, data['Volume'].max() * 1.1)
-            ax3.spines['bottom'].set_color('#333')
-            ax3.spines['top'].set_color('#333')
-            ax3.spines['right'].set_color('#333')
-            ax3.spines['left'].set_color('#333')
-        elif show_macd:
-            macd, signal = calculate_macd(data['Close'], settings.macd_fast_period, settings.macd_slow_period, settings.macd_signal_period)
-            ax4.set_facecolor('#1e1e1e')
-            ax4.tick_params(axis='x', colors='#d4d4d4')
-            ax4.tick_params(axis='y', colors='#d4d4d4')
-            ax4.set_title("MACD", color='#d4d4d4')
-            ax4.set_ylabel("MACD", color='#d4d4d4')
-            ax4.plot(data.index, macd, color='blue', label='MACD')
-            ax4.plot(data.index, signal, color='red', label='Sinal')
-            histogram = macd - signal
-            ax4.bar(data.index, histogram, color='gray', label='Histograma')
-            ax4.axhline(0, color='black', linestyle='--')
-            ax4.legend(labelcolor='#d4d4d4')
-            ax4.spines['bottom'].set_color('#333')
-            ax4.spines['top'].set_color('#333')
-            ax4.spines['right'].set_color('#333')
-            ax4.spines['left'].set_color('#333')
-        elif show_estocastico_normal:
-            estocastico = calcular_estocastico_normal(data, settings.stochastic_k_period)
-            ax5.set_facecolor('#1e1e1e')
-            ax5.tick_params(axis='x', colors='#d4d4d4')
-            ax5.tick_params(axis='y', colors='#d4d4d4')
-            ax5.set_title("Estocástico Normal", color='#d4d4d4')
-            ax5.set_ylabel("Valor Estocástico", color='#d4d4d4')
-            ax5.plot(estocastico, label='Estocástico Normal', color='purple')
-            ax5.axhline(20, color='red', linestyle='--', label='SV')
-            ax5.axhline(80, color='green', linestyle='--', label='SC')
-            ax5.legend(labelcolor='#d4d4d4')
-            ax5.spines['bottom'].set_color('#333')
-            ax5.spines['top'].set_color('#333')
-            ax5.spines['right'].set_color('#333')
-            ax5.spines['left'].set_color('#333')
-        elif show_estocastico_lento:
-            estocastico_lento, estocastico_d = calcular_estocastico_lento(data, settings.stochastic_k_period, settings.stochastic_d_period)
-            ax6.set_facecolor('#1e1e1e')
-            ax6.tick_params(axis='x', colors='#d4d4d4')
-            ax6.tick_params(axis='y', colors='#d4d4d4')
-            ax6.set_title("Estocástico Lento", color='#d4d4d4')
-            ax6.set_ylabel("Valor Estocástico", color='#d4d4d4')
-            ax6.plot(estocastico_lento, label='K Estocástico Lento', color='purple')
-            ax6.plot(estocastico_d, label='D Estocástico Lento', color='orange')
-            ax6.axhline(20, color='red', linestyle='--', label='SV')
-            ax6.axhline(80, color='green', linestyle='--', label='SC')
-            ax6.legend(labelcolor='#d4d4d4')
-            ax6.spines['bottom'].set_color('#333')
-            ax6.spines['top'].set_color('#333')
-            ax6.spines['right'].set_color('#333')
-            ax6.spines['left'].set_color('#333')
-
-        if show_bandas_bollinger:
-            media_movel, banda_superior, banda_inferior = calcular_bandas_bollinger(data['Close'], settings.ma_period)
-            ax1.plot(media_movel, label='Média Móvel', color='blue')
-            ax1.plot(banda_superior, label='Banda Superior', color='red', linestyle='--')
-            ax1.plot(banda_inferior, label='Banda Inferior', color='green', linestyle='--')
-            ax1.fill_between(data.index, banda_inferior, banda_superior, color='gray', alpha=0.3)
-            ax1.legend(labelcolor='#d4d4d4', facecolor='#1e1e1e', edgecolor='#333')
-
-        plt.tight_layout()
-
-        ax1.bar(up.index, up.Close - up.Open, width, bottom=up.Open, color='g')
-        ax1.bar(up.index, up.High - up.Close, width2, bottom=up.Close, color='g')
-        ax1.bar(up.index, up.Low - up.Open, width2, bottom=up.Open, color='g')
-
-        ax1.bar(down.index, down.Close - down.Open, width, bottom=down.Open, color='r')
-        ax1.bar(down.index, down.High - down.Open, width2, bottom=down.Open, color='r')
-        ax1.bar(down.index, down.Low - down.Close, width2, bottom=down.Close, color='r')
-
-        if 'SMA' in medias:
-            sma = data['Close'].rolling(window=settings.ma_period).mean()
-            ax1.plot(data.index, sma, color='cyan', label='SMA')
-        if 'EMA' in medias:
-            ema = data['Close'].ewm(span=settings.ema_period, adjust=False).mean()
-            ax1.plot(data.index, ema, color='blue', label='EMA')
-        if 'WMA' in medias:
-            wma = data['Close'].rolling(window=settings.wma_period).apply(lambda x: np.average(x, weights=np.arange(len(x), 0, -1)))
-            ax1.plot(data.index, wma, color='#6495ED', label='WMA')
-
-        ax1.grid(True, color='#333')
-        ax1.xaxis.set_major_locator(plt.MaxNLocator(10))
-        plt.xticks(rotation=45, color='#d4d4d4')
-        plt.tight_layout()
-        canvas.figure.tight_layout()
-
-        if 'SMA' in medias or 'EMA' in medias or 'WMA' in medias:
-            ax1.legend(labelcolor='#d4d4d4', facecolor='#1e1e1e', edgecolor='#333')
-
-        def zoom(event):
-            if event.inaxes is not None:
-                xlim = ax1.get_xlim()
-                xlim_dates = [mdates.num2date(x) for x in xlim]
-                mouse_x = mdates.num2date(event.xdata) if event.xdata else None
-                current_range_seconds = (xlim_dates[1] - xlim_dates[0]).total_seconds()
-                zoom_amount = pd.Timedelta(seconds=current_range_seconds * 0.3)
-                if event.button == 'down':
-                    new_xlim = [mouse_x - zoom_amount, mouse_x + zoom_amount] if mouse_x else xlim_dates
-                elif event.button == 'up':
-                    new_xlim = [xlim_dates[0] - zoom_amount, xlim_dates[1] + zoom_amount]
-                data_start = mdates.date2num(data.index[0])
-                data_end = mdates.date2num(data.index[-1])
-                new_xlim_numeric = [mdates.date2num(x) for x in new_xlim]
-                new_xlim_clamped = [
-                    max(data_start, new_xlim_numeric[0]),
-                    min(data_end, new_xlim_numeric[1])
-                ]
-                ax1.set_xlim(mdates.num2date(new_xlim_clamped[0]), mdates.num2date(new_xlim_clamped[1]))
-                canvas.draw()
-
-        canvas.mpl_connect('scroll_event', zoom)
-        canvas.draw()
+    def fetch_older_history(symbol, new_start, end_date, candlestick_period, cache):
+        """
+        Candles from ``new_start``, after fetching the days before the cached series.
+
+        Returns None when the provider has no bars there (the ticker was not
+        listed yet). Errors propagate, so the next pan tries again.
+        """
+        import pandas as pd
+        from stocklibs import stockdata, resample
+        from stocklibs.history_store import slice_range
+        new_start = DataFetcher._to_date_string(new_start)
+        end_date = DataFetcher._to_date_string(end_date)
+        entry = cache.get(symbol)
+        if entry is None:
+            return DataFetcher.fetch_stock_data(symbol, new_start, end_date, candlestick_period, cache)
+        # Pede tudo antes do primeiro candle guardado, inclusive um trecho cuja busca anterior falhou
+        first_bar = entry[2].index[0].strftime("%Y-%m-%d")
+        if new_start >= first_bar:
+            return DataFetcher.fetch_stock_data(symbol, new_start, end_date, candlestick_period, cache)
+
+        older = stockdata.fetch_range(symbol, new_start, first_bar)
+        if older.empty:
+            return None
+        daily = pd.concat([older[['Open', 'High', 'Low', 'Close', 'Volume']].dropna(), entry[2]])
+        daily = daily[~daily.index.duplicated(keep='last')].sort_index()
+        cache[symbol] = (new_start, entry[1], daily)
+        return resample.aggregate(slice_range(daily, new_start, end_date), candlestick_period)
+
+    @staticmethod
+    def to_date(value):
+        if isinstance(value, QDate):
+            return date(value.year(), value.month(), value.day())
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, str):
+            return datetime.strptime(value, "%Y-%m-%d").date()
+        return value
+
+    @staticmethod
+    def _to_date_string(value):
+        if isinstance(value, QDate):
+            return value.toString("yyyy-MM-dd")
+        if isinstance(value, (date, datetime)):
+            return value.strftime("%Y-%m-%d")
+        return value
 
 class IndicatorUpdater:
     def __init__(self, pvp_indicator, pe_indicator, roe_indicator, dividend_yield_indicator, debt_to_ebitda_indicator, net_margin_indicator):
@@ -259,7 +119,16 @@ class IndicatorUpdater:
         self.debt_to_ebitda_indicator = debt_to_ebitda_indicator
         self.net_margin_indicator = net_margin_indicator
 
-    def update_indicators(self, ticker):
+    def update_indicators(self, ticker, runner=None):
+        if runner is None:
+            self.show_indicators(self.fetch_indicators(ticker))
+        else:
+            runner.submit('indicators', self.fetch_indicators, ticker, on_result=self.show_indicators)
+
+    @staticmethod
+    def fetch_indicators(ticker):
+        # Roda fora da thread da interface: apenas rede e cálculos, nenhum widget
+        from stocklibs import stockdata
         try:
             ticker_pvp = stockdata.fetch_pvp(ticker.upper())
             ticker_pe = stockdata.fetch_pe(ticker.upper())
@@ -269,12 +138,15 @@ class IndicatorUpdater:
             ticker_net_margin = stockdata.fetch_net_margin(ticker.upper())
         except Exception:
             ticker_pvp = ticker_pe = ticker_roe = ticker_dividend_yield = ticker_debt_to_ebitda = ticker_net_margin = "Não disponível"
+        return ticker_pvp, ticker_pe, ticker_roe, ticker_dividend_yield, ticker_debt_to_ebitda, ticker_net_margin
 
+    def show_indicators(self, values):
+        ticker_pvp, ticker_pe, ticker_roe, ticker_dividend_yield, ticker_debt_to_ebitda, ticker_net_margin = values
         self.pvp_indicator.setText(f"P/VP: <b>{ticker_pvp}</b>")
         self.pe_indicator.setText(f"P/L: <b>{ticker_pe}</b>")
         self.roe_indicator.setText(f"ROE: <b>{ticker_roe}</b>")
         self.dividend_yield_indicator.setText(f"Dividend Yield: <b>{ticker_dividend_yield}</b>")
-        if ticker_debt_to_ebitda is not None:
+        if isinstance(ticker_debt_to_ebitda, (int, float)):
             self.debt_to_ebitda_indicator.setText(f"Dívida/EBITDA: <b>{ticker_debt_to_ebitda:.2f}</b>")
         else:
             self.debt_to_ebitda_indicator.setText("Dívida/EBITDA: <b>Não disponível</b>")
@@ -288,11 +160,8 @@ class NovaGUI(QMainWindow):
         self.current_analysis.start_date = self.current_settings.start_date
         self.current_analysis.end_date = self.current_settings.end_date
         self.current_analysis.candlestick_period = self.current_settings.candlestick_period
-        self.candlestick_cache = {}
-        self.mouse_move_timer = QTimer(self)
-        self.mouse_move_timer.setSingleShot(True)
-        self.mouse_move_timer.timeout.connect(self.delayed_draw)
-        self.last_mouse_event = None
+        self.candlestick_cache = CandleCache(self.current_settings.get('candle_cache_max_mb', 256) * 1024 * 1024)
+        self.task_runner = TaskRunner(self)
 
         self.setWindowTitle("Nova Stocks")
         self.setGeometry(100, 100, 900, 600)
@@ -307,10 +176,21 @@ class NovaGUI(QMainWindow):
         self.graph_layout = QVBoxLayout(self.graph_frame)
         self.main_layout.addWidget(self.graph_frame)
 
-        self.canvas = FigureCanvas(plt.Figure())
-        self.canvas.figure.patch.set_facecolor('#252525')  # Set background color
-        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.graph_layout.addWidget(self.canvas)
+        # O canvas e o Plotter só são criados no primeiro gráfico (ensure_chart)
+        self.canvas = None
+        self.chart_interaction = None
+        self.plotter = None
+        self.pending_chart = None
+        self.history_request = None
+        self.history_exhausted = set()
+
+        # Enquanto o gráfico é renderizado em segundo plano, um aviso ocupa o lugar do canvas
+        self.render_placeholder = QLabel("", self)
+        self.render_placeholder.setAlignment(Qt.AlignCenter)
+        self.render_placeholder.setStyleSheet("color: #d4d4d4;")
+        self.chart_stack = QStackedWidget(self)
+        self.chart_stack.addWidget(self.render_placeholder)
+        self.graph_layout.addWidget(self.chart_stack)
 
         self.menubar = QMenuBar(self)
         self.setMenuBar(self.menubar)
@@ -403,9 +283,16 @@ class NovaGUI(QMainWindow):
 
         self.update_menu_state()
 
+    def apply_cache_settings(self):
+        # Os limites dos caches valem na hora, sem reiniciar o programa
+        from stocklibs import stockdata
+        self.candlestick_cache.set_max_bytes(self.current_settings.get('candle_cache_max_mb', 256) * 1024 * 1024)
+        stockdata.info_cache.ttl = self.current_settings.get('info_cache_ttl', 300)
+
     def open_settings(self):
         if not (self.current_analysis.ticker is None):
             settings_dialog = SettingsDialog(self, self.current_settings)
+            settings_dialog.settings_changed.connect(self.apply_cache_settings)
             settings_dialog.settings_changed.connect(self.plot_chart)
             settings_dialog.exec()
         else:
@@ -436,40 +323,159 @@ class NovaGUI(QMainWindow):
         self.plot_chart()
 
     def abrir_popup_ticker(self):
-        ticker, ok = QInputDialog.getText(self, "Input", "Por favor, insira o ticker da ação:")
-        if ok and ticker:
-            ticker = ticker.upper()
-            if not stockdata.is_valid_ticker(ticker):
-                QMessageBox.warning(self, "Erro", "Ticker inválido. Por favor, insira um ticker válido.")
-                return
-            self.set_ticker(ticker)
-            self.plot_chart()
+        from stocklibs.tickers import ticker_index
+        from stocklibs.ticker_completer import TickerCompleter
+        self.refresh_ticker_index()
+
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("Input")
+        dialog.setLabelText("Por favor, insira o ticker da ação:")
+        dialog.setInputMode(QInputDialog.TextInput)
+        TickerCompleter(ticker_index, dialog.findChild(QLineEdit))
+        if dialog.exec() != QDialog.Accepted or not dialog.textValue().strip():
+            return
+
+        ticker = dialog.textValue().split()[0].upper()
+        if ticker in ticker_index:
+            self.open_ticker(ticker)
+            return
+        # Ticker fora do índice local: confirma pela rede em segundo plano
+        from stocklibs import stockdata
+        self.task_runner.submit(
+            'ticker',
+            stockdata.is_valid_ticker,
+            ticker,
+            on_result=lambda valid: self.open_ticker(ticker) if valid else QMessageBox.warning(self, "Erro", "Ticker inválido. Por favor, insira um ticker válido."),
+            on_error=lambda message: QMessageBox.warning(self, "Erro", message)
+        )
+
+    def open_ticker(self, ticker):
+        self.set_ticker(ticker)
+        self.plot_chart()
+
+    def refresh_ticker_index(self):
+        # A lista de tickers da B3 é atualizada em segundo plano quando fica velha
+        from stocklibs.tickers import ticker_index
+        max_age = self.current_settings.get('ticker_index_days', 7) * 24 * 60 * 60
+        if ticker_index.refreshing or not ticker_index.is_stale(max_age):
+            return
+        ticker_index.refreshing = True
+        self.task_runner.submit(
+            'tickers',
+            ticker_index.refresh,
+            on_error=lambda message: print(f"Erro ao atualizar a lista de tickers: {message}")
+        )
 
     def plot_chart(self):
-        try:
-            data = DataFetcher.fetch_stock_data(
-                self.current_analysis.ticker,
-                self.current_analysis.start_date,
-                self.current_analysis.end_date,
-                self.current_analysis.candlestick_period,
-                self.candlestick_cache
-            )
-            Plotter.plot_candlestick_chart(
-                self.canvas,
-                data,
-                self.current_analysis.ticker,
-                self.current_settings,
-                self.current_analysis.medias,
-                self.current_analysis.show_volume,
-                self.current_analysis.show_ifr,
-                self.current_analysis.show_macd,
-                self.current_analysis.show_bandas_bollinger,
-                self.current_analysis.show_estocastico_normal,
-                self.current_analysis.show_estocastico_lento,
-                self.current_analysis.candlestick_period
-            )
-        except ValueError as e:
-            QMessageBox.warning(self, "Erro", str(e))
+        # A busca roda em segundo plano; um novo pedido descarta o resultado do anterior
+        self.task_runner.cancel('history')
+        self.history_request = None
+        ticker = self.current_analysis.ticker
+        candlestick_period = self.current_analysis.candlestick_period
+        self.task_runner.submit(
+            'chart',
+            DataFetcher.fetch_stock_data,
+            ticker,
+            self.current_analysis.start_date,
+            self.current_analysis.end_date,
+            candlestick_period,
+            self.candlestick_cache,
+            on_result=lambda data: self.draw_chart(data, ticker, candlestick_period),
+            on_error=lambda message: QMessageBox.warning(self, "Erro", message)
+        )
+
+    def ensure_chart(self):
+        if self.canvas is not None:
+            return
+        from matplotlib.figure import Figure
+        from stocklibs.chart import Plotter
+        from stocklibs.chart_interaction import ChartInteraction
+        from stocklibs.render import ThreadedCanvas
+
+        self.canvas = ThreadedCanvas(Figure())
+        self.canvas.figure.patch.set_facecolor('#252525')  # Set background color
+        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.chart_interaction = ChartInteraction(self.canvas)
+        self.plotter = Plotter(self.canvas, self.chart_interaction, self.task_runner)
+        # Histórico mais antigo é buscado em segundo plano quando o gráfico chega perto do início
+        self.chart_interaction.on_left_edge = self.extend_history
+
+        self.chart_stack.addWidget(self.canvas)
+        self.chart_stack.setCurrentWidget(self.canvas)
+        self.canvas.render_started.connect(self.show_render_placeholder)
+        self.canvas.render_finished.connect(self.on_chart_rendered)
+
+    def show_render_placeholder(self):
+        self.render_placeholder.setText("Renderizando gráfico...")
+        self.chart_stack.setCurrentWidget(self.render_placeholder)
+
+    def draw_chart(self, data, ticker, candlestick_period, keep_view=False):
+        self.ensure_chart()
+        if self.canvas.rendering:
+            # A figura pertence à thread de renderização; o pedido mais recente é desenhado ao final
+            self.pending_chart = (data, ticker, candlestick_period, keep_view)
+            return
+        self.plotter.plot_candlestick_chart(
+            data,
+            ticker,
+            self.current_settings,
+            self.current_analysis.medias,
+            self.current_analysis.show_volume,
+            self.current_analysis.show_ifr,
+            self.current_analysis.show_macd,
+            self.current_analysis.show_bandas_bollinger,
+            self.current_analysis.show_estocastico_normal,
+            self.current_analysis.show_estocastico_lento,
+            candlestick_period,
+            keep_view
+        )
+
+    def extend_history(self):
+        ticker = self.current_analysis.ticker
+        if ticker is None or self.history_request is not None or ticker in self.history_exhausted:
+            return
+        # Cada busca dobra o período exibido (no mínimo seis meses); o cache só baixa a parte nova
+        start_date = DataFetcher.to_date(self.current_analysis.start_date)
+        end_date = DataFetcher.to_date(self.current_analysis.end_date)
+        new_start = start_date - max(end_date - start_date, timedelta(days=180))
+        candlestick_period = self.current_analysis.candlestick_period
+        self.history_request = new_start
+        self.task_runner.submit(
+            'history',
+            DataFetcher.fetch_older_history,
+            ticker,
+            new_start,
+            end_date,
+            candlestick_period,
+            self.candlestick_cache,
+            on_result=lambda data: self.prepend_history(data, ticker, new_start, candlestick_period),
+            on_error=lambda message: self.stop_history(ticker, message)
+        )
+
+    def prepend_history(self, data, ticker, new_start, candlestick_period):
+        self.history_request = None
+        if ticker != self.current_analysis.ticker or candlestick_period != self.current_analysis.candlestick_period:
+            return
+        if data is None:
+            # O provedor não tem pregões antes disso: o papel ainda não era listado
+            self.history_exhausted.add(ticker)
+            return
+        current = self.plotter.data if self.plotter is not None else None
+        if current is not None and not data.index[0] < current.index[0]:
+            return
+        self.current_analysis.start_date = new_start
+        self.draw_chart(data, ticker, candlestick_period, keep_view=True)
+
+    def stop_history(self, ticker, message):
+        # Erro de rede ou limite de requisições: o próximo arrasto tenta de novo
+        print(f"Erro ao buscar histórico anterior de {ticker}: {message}")
+        self.history_request = None
+
+    def on_chart_rendered(self):
+        self.chart_stack.setCurrentWidget(self.canvas)
+        if self.pending_chart is not None:
+            pending, self.pending_chart = self.pending_chart, None
+            self.draw_chart(*pending)
 
     def mostrar_media_movel_simples(self):
         if 'SMA' in self.current_analysis.medias:
@@ -540,8 +546,10 @@ class NovaGUI(QMainWindow):
             self.plot_chart()
 
     def set_ticker(self, ticker):
+        from stocklibs import stockdata
+        stockdata.info_cache.ttl = self.current_settings.get('info_cache_ttl', 300)
         self.current_analysis.ticker = ticker
-        self.indicator_updater.update_indicators(ticker)
+        self.indicator_updater.update_indicators(ticker, self.task_runner)
         self.update_menu_state()
 
     def update_menu_state(self):
@@ -554,6 +562,7 @@ class NovaGUI(QMainWindow):
 
     def show_detailed_metrics(self):
         if self.current_analysis.ticker:
+            from stocklibs.metrics import MetricsWindow
             self.metrics_window = MetricsWindow(self.current_analysis.ticker)
             self.metrics_window.show()
         else:
@@ -561,6 +570,7 @@ class NovaGUI(QMainWindow):
 
     def open_smart_metrics(self):
         if self.current_analysis.ticker:
+            from stocklibs.smart_metrics import SmartMetricsWindow
             self.smart_metrics_window = SmartMetricsWindow(self.current_analysis.ticker)
             self.smart_metrics_window.show()
         else:
@@ -568,6 +578,7 @@ class NovaGUI(QMainWindow):
 
     def show_revenue_income_chart(self):
         if self.current_analysis.ticker:
+            from stocklibs.revenue_income_chart import RevenueIncomeChart
             self.revenue_income_chart = RevenueIncomeChart(self.current_analysis.ticker)
             self.revenue_income_chart.show()
         else:
@@ -575,6 +586,7 @@ class NovaGUI(QMainWindow):
 
     def show_assets_liabilities_chart(self):
         if self.current_analysis.ticker:
+            from stocklibs.assets_liabilities_chart import AssetsLiabilitiesChart
             self.assets_liabilities_chart = AssetsLiabilitiesChart(self.current_analysis.ticker)
             self.assets_liabilities_chart.show()
         else:
@@ -637,6 +649,9 @@ class NovaGUI(QMainWindow):
                 # Adicionar gráfico de candlestick
                 document.add_heading("Gráfico de Candlestick", level=2)
                 temp_image_path = "temp_candlestick_chart.png"
+                self.ensure_chart()
+                # A figura não é thread-safe: espera a renderização em segundo plano liberá-la
+                self.canvas.wait_for_render()
                 self.canvas.figure.savefig(temp_image_path, bbox_inches='tight')
                 document.add_picture(temp_image_path, width=Inches(6))
                 os.remove(temp_image_path)
@@ -670,15 +685,6 @@ class NovaGUI(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Erro", f"Erro ao gerar relatório: {e}")
 
-    def delayed_draw(self):
-        if self.last_mouse_event:
-            self.plot_chart()
-            self.last_mouse_event = None
-
-    def mouseMoveEvent(self, event):
-        self.last_mouse_event = event
-        self.mouse_move_timer.start(100)
-
     def desfazer(self):
         if self.current_analysis.plot_history:
             self.current_analysis.plot_history.pop()
@@ -724,5 +730,6 @@ class NovaGUI(QMainWindow):
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     mainWin = NovaGUI()
+    startup_timer = FirstPaintTimer(mainWin, STARTED)
     mainWin.show()
     sys.exit(app.exec())
\ No newline at end of file
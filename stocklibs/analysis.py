@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import date, timedelta
+from .cache import CandleCache
 
 @dataclass
 class StockAnalysis:
@@ -22,27 +23,23 @@ class StockAnalysis:
     show_estocastico_lento: bool = False  # New attribute to track Estocástico Lento visibility
     show_buy_signals: bool = False  # New attribute to track buy signals visibility
     
-    candlestick_cache: dict = field(default_factory=dict)  # Cache para armazenar dados dos candlesticks
+    candlestick_cache: CandleCache = field(default_factory=CandleCache)  # Cache para armazenar dados dos candlesticks
 
+    # Cada painel inferior é independente; qualquer combinação pode ficar visível ao mesmo tempo
     def toggle_ifr(self):
         self.show_ifr = not self.show_ifr
-        self.show_macd, self.show_estocastico_normal, self.show_estocastico_lento, self.show_buy_signals, self.show_volume = False, False, False, False, False
 
     def toggle_macd(self):
         self.show_macd = not self.show_macd
-        self.show_ifr, self.show_estocastico_normal, self.show_estocastico_lento, self.show_buy_signals, self.show_volume = False, False, False, False, False
 
     def toggle_estocastico_normal(self):
         self.show_estocastico_normal = not self.show_estocastico_normal
-        self.show_ifr, self.show_macd, self.show_estocastico_lento, self.show_buy_signals, self.show_volume = False, False, False, False, False
 
     def toggle_estocastico_lento(self):
         self.show_estocastico_lento = not self.show_estocastico_lento
-        self.show_ifr, self.show_macd, self.show_estocastico_normal, self.show_buy_signals, self.show_volume = False, False, False, False, False
 
     def mostrar_bandas_bollinger(self):
         self.show_bandas_bollinger = not self.show_bandas_bollinger
 
     def show_volumes(self):
-        self.show_volume = not self.show_volume  # Alterna o estado de exibição do volume   
-        self.show_ifr, self.show_macd, self.show_estocastico_normal, self.show_estocastico_lento = False, False, False, False
\ No newline at end of file
+        self.show_volume = not self.show_volume  # Alterna o estado de exibição do volume
\ No newline at end of file
@@ -1,9 +1,9 @@
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QComboBox, QMessageBox
-import yfinance as yf
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from .stockdata import convert_to_brl_naturallanguage 
+from .stockdata import convert_to_brl_naturallanguage, get_statement 
 from .assets import styles
+from .workers import TaskRunner
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 
@@ -13,6 +13,7 @@ class AssetsLiabilitiesChart(QMainWindow):
         self.setStyleSheet(styles.light_mode)
         self.ticker = ticker
         self.period = "Trimestral"  # Default to quarterly view
+        self.task_runner = TaskRunner(self)
         self.setup_ui()
         if ticker:
             self.load_data()
@@ -41,15 +42,19 @@ class AssetsLiabilitiesChart(QMainWindow):
         if not self.ticker:
             return
 
-        ticker = self.ticker + ".SA" if not self.ticker.endswith(".SA") else self.ticker
-        stock = yf.Ticker(ticker)
-
+        # Os demonstrativos ficam em cache, trocar o período não baixa nada de novo
+        statement = 'quarterly_balance_sheet' if self.period == "Trimestral" else 'balance_sheet'
+        self.task_runner.submit(
+            'statements',
+            get_statement,
+            self.ticker,
+            statement,
+            on_result=self.show_financials,
+            on_error=lambda message: print(f"Error loading financial data: {message}")
+        )
+
+    def show_financials(self, financials):
         try:
-            if self.period == "Trimestral":
-                financials = stock.quarterly_balance_sheet
-            else:
-                financials = stock.balance_sheet
-
             # Extract total assets
             self.total_assets = financials.loc['Total Assets']
 
@@ -0,0 +1,211 @@
+import sys
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+class SingleFlight:
+    """
+    Coalesces concurrent loads of the same key into a single call.
+
+    While a load for a key is in flight, later callers wait on its future
+    instead of issuing a duplicate request, and get the same result (or
+    exception). ``copy``, if given, is applied to the result handed to those
+    waiting callers, for values they might modify in place.
+    """
+
+    def __init__(self, copy=None):
+        self.copy = copy
+        self._futures = {}  # key -> Future of the load in flight
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, loader):
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = Future()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            result = future.result()
+            return self.copy(result) if self.copy else result
+
+        try:
+            result = loader()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._futures[key]
+
+    def stats(self):
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._futures)}
+
+class TTLCache:
+    """
+    Values loaded per key and kept for ``ttl`` seconds.
+
+    Concurrent misses on the same key share one load (see SingleFlight).
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._entries = {}  # key -> (timestamp, value)
+        self._lock = threading.Lock()
+        self.flights = SingleFlight()
+
+    def get(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+
+        return self.flights.do(key, lambda: self._load(key, loader))
+
+    def _load(self, key, loader):
+        value = loader(key)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+class InfoCache(TTLCache):
+    """
+    Snapshot of the provider's info dictionary per symbol.
+
+    All the fetch_* metric functions read the same JSON blob, so a single
+    download per symbol is enough while the snapshot is fresh.
+    """
+
+class StatementsCache(TTLCache):
+    """
+    Quarterly and annual income, balance and cash-flow tables per symbol.
+
+    Statements are published a few times a year, so the default TTL is long.
+    """
+
+    STATEMENTS = (
+        'financials', 'quarterly_financials',
+        'balance_sheet', 'quarterly_balance_sheet',
+        'cashflow', 'quarterly_cashflow',
+    )
+
+    def __init__(self, ttl=6 * 60 * 60):
+        super().__init__(ttl)
+
+class CandleCache:
+    """
+    Dict-like LRU cache bounded by the memory used by its values.
+
+    Sizes come from ``DataFrame.memory_usage(deep=True)``; the least recently
+    used entries are evicted once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        size = _sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Nunca caberia no orçamento, não vale a pena guardar
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+_MISSING = object()
+
+def _sizeof(value):
+    if hasattr(value, 'memory_usage'):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sum(_sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sum(_sizeof(item) for item in value.values())
+    return sys.getsizeof(value)
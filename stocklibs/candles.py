@@ -0,0 +1,125 @@
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection, LineCollection
+from matplotlib.ticker import Formatter
+
+UP_COLOR = 'g'
+DOWN_COLOR = 'r'
+
+def date_positions(index):
+    """
+    Convert a (possibly timezone-aware) DatetimeIndex to Matplotlib date numbers.
+    """
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return mdates.date2num(index.to_numpy())
+
+def index_positions(index):
+    """
+    Trading-day positions: bar i sits at x = i, so weekends and holidays leave no gaps.
+    """
+    return np.arange(len(index), dtype=float)
+
+class TradingDayFormatter(Formatter):
+    """
+    Tick formatter for an axis in trading-day positions (see index_positions).
+
+    Ticks are mapped back to dates by indexing a precomputed datetime64
+    array, with no date2num/num2date conversion per tick.
+    """
+
+    def __init__(self, index):
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        self.dates = index.to_numpy(dtype='datetime64[D]')
+
+    def __call__(self, x, pos=None):
+        i = int(round(x))
+        if i < 0 or i >= len(self.dates):
+            return ''
+        day = str(self.dates[i])  # AAAA-MM-DD
+        return f"{day[8:10]}/{day[5:7]}/{day[:4]}"
+
+def body_vertices(x, open_, close, width):
+    """
+    Rectangle vertices (n, 4, 2) of the candle bodies.
+    """
+    half = width / 2
+    left = x - half
+    right = x + half
+    verts = np.empty((len(x), 4, 2))
+    verts[:, 0, 0] = left
+    verts[:, 0, 1] = open_
+    verts[:, 1, 0] = left
+    verts[:, 1, 1] = close
+    verts[:, 2, 0] = right
+    verts[:, 2, 1] = close
+    verts[:, 3, 0] = right
+    verts[:, 3, 1] = open_
+    return verts
+
+def wick_segments(x, high, low):
+    """
+    Line segments (n, 2, 2) from low to high of each candle.
+    """
+    segments = np.empty((len(x), 2, 2))
+    segments[:, 0, 0] = x
+    segments[:, 0, 1] = low
+    segments[:, 1, 0] = x
+    segments[:, 1, 1] = high
+    return segments
+
+def draw_candles(ax, x, open_, high, low, close, width, up_color=UP_COLOR, down_color=DOWN_COLOR):
+    """
+    Draw candles with one PolyCollection (bodies) and one LineCollection
+    (wicks) per colour, instead of one Rectangle artist per bar.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Target axes
+    x : array-like
+        Bar positions in data units (e.g. from date_positions)
+    open_, high, low, close : array-like
+        Prices of each bar
+    width : float
+        Body width in data units
+
+    Returns
+    -------
+    dict
+        'up_bodies', 'up_wicks', 'down_bodies', 'down_wicks' collections
+    """
+    x = np.asarray(x, dtype=float)
+    open_ = np.asarray(open_, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+
+    artists = {}
+    up = close >= open_
+    for name, mask, color in (('up', up, up_color), ('down', ~up, down_color)):
+        wicks = LineCollection(wick_segments(x[mask], high[mask], low[mask]), colors=color, linewidths=1)
+        bodies = PolyCollection(body_vertices(x[mask], open_[mask], close[mask], width), facecolors=color, edgecolors=color, linewidths=0.5)
+        ax.add_collection(wicks)
+        ax.add_collection(bodies)
+        artists[f'{name}_wicks'] = wicks
+        artists[f'{name}_bodies'] = bodies
+
+    ax.autoscale_view()
+    return artists
+
+def update_candles(artists, x, open_, high, low, close, width):
+    """
+    Replace the data of the collections created by draw_candles, in place.
+    """
+    x = np.asarray(x, dtype=float)
+    open_ = np.asarray(open_, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+
+    up = close >= open_
+    for name, mask in (('up', up), ('down', ~up)):
+        artists[f'{name}_wicks'].set_segments(wick_segments(x[mask], high[mask], low[mask]))
+        artists[f'{name}_bodies'].set_verts(body_vertices(x[mask], open_[mask], close[mask], width))
@@ -0,0 +1,374 @@
+import numpy as np
+import matplotlib.gridspec as gridspec
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import MaxNLocator
+from . import indicators, candles, lod
+
+# Painéis inferiores, de cima para baixo
+LOWER_PANES = ('ifr', 'volume', 'macd', 'estocastico_normal', 'estocastico_lento')
+
+# Título e rótulo do eixo y de cada painel inferior
+PANE_TITLES = {
+    'ifr': ("IFR", "Valor do IFR"),
+    'volume': ("Volume", "Volume"),
+    'macd': ("MACD", "MACD"),
+    'estocastico_normal': ("Estocástico Normal", "Valor Estocástico"),
+    'estocastico_lento': ("Estocástico Lento", "Valor Estocástico"),
+}
+
+# Linhas horizontais fixas de cada painel: (nível, cor, rótulo)
+PANE_GUIDES = {
+    'ifr': ((30, 'red', 'SV'), (70, 'green', 'SC')),
+    'macd': ((0, 'black', '_nolegend_'),),
+    'estocastico_normal': ((20, 'red', 'SV'), (80, 'green', 'SC')),
+    'estocastico_lento': ((20, 'red', 'SV'), (80, 'green', 'SC')),
+}
+
+# Painéis com escala fixa em vez de ajustada aos dados
+PANE_LIMITS = {
+    'ifr': (0, 100),
+}
+
+# Sobreposições: eixo (preço ou painel), indicador calculado e partes desenhadas como (tipo, série, estilo)
+OVERLAYS = {
+    'SMA': ('price', 'sma', (('line', 'sma', dict(color='cyan', label='SMA')),)),
+    'EMA': ('price', 'ema', (('line', 'ema', dict(color='blue', label='EMA')),)),
+    'WMA': ('price', 'wma', (('line', 'wma', dict(color='#6495ED', label='WMA')),)),
+    'bollinger': ('price', 'bollinger', (
+        ('line', 'bollinger_mid', dict(color='blue', label='Média Móvel')),
+        ('line', 'bollinger_upper', dict(color='red', linestyle='--', label='Banda Superior')),
+        ('line', 'bollinger_lower', dict(color='green', linestyle='--', label='Banda Inferior')),
+        ('fill', ('bollinger_lower', 'bollinger_upper'), dict(color='gray', alpha=0.3)),
+    )),
+    'ifr': ('ifr', 'rsi', (('line', 'rsi', dict(color='purple', label='IFR')),)),
+    'volume': ('volume', None, (('bars', 'Volume', dict(color='b', alpha=0.5)),)),
+    'macd': ('macd', 'macd', (
+        ('line', 'macd', dict(color='blue', label='MACD')),
+        ('line', 'macd_signal', dict(color='red', label='Sinal')),
+        ('bars', 'macd_hist', dict(color='gray', label='Histograma')),
+    )),
+    'estocastico_normal': ('estocastico_normal', 'stochastic', (('line', 'stochastic_k', dict(color='purple', label='Estocástico Normal')),)),
+    'estocastico_lento': ('estocastico_lento', 'stochastic', (
+        ('line', 'stochastic_k', dict(color='purple', label='K Estocástico Lento')),
+        ('line', 'stochastic_d', dict(color='orange', label='D Estocástico Lento')),
+    )),
+}
+
+class Plotter:
+    """
+    Candlestick chart that keeps its figure, axes and artists between calls.
+
+    Only what changed is touched: toggling an overlay adds or removes that
+    overlay's artists, and a new data range updates the existing candles and
+    lines in place.
+
+    Any combination of lower panes (see LOWER_PANES) is stacked under the
+    price axes on a shared x-axis. Showing or hiding a pane adds or removes
+    only that axes and re-arranges the others; indicators are computed only
+    for visible panes, in one call, so panes share intermediates such as the
+    EMAs or the stochastic %K.
+    """
+
+    def __init__(self, canvas, interaction=None, runner=None):
+        self.canvas = canvas
+        self.interaction = interaction
+        self.runner = runner
+        self.layout = None
+        self.panes = ()
+        self.axes = {}
+        self.detail = None
+        self.candle_artists = None
+        self.data_key = None
+        self.positions = None
+        self.width = None
+        self.data = None
+        self.overlays = {}  # nome -> (chave dos dados, artistas)
+
+    def plot_candlestick_chart(self, data, ticker, settings, medias, show_volume, show_ifr, show_macd, show_bandas_bollinger, show_estocastico_normal, show_estocastico_lento, candlestick_period, keep_view=False):
+        panes = Plotter.visible_panes(show_volume, show_ifr, show_macd, show_estocastico_normal, show_estocastico_lento)
+        # Eixo por índice de pregão: sem buracos de fins de semana e feriados, um espaço por candle
+        trading_days = settings.get('trading_day_axis', False)
+        rebuilt = self.layout != (settings.get('chart_lod', True), trading_days)
+        if rebuilt:
+            self._build_axes(settings.get('chart_lod', True), trading_days)
+
+        ax1 = self.axes['price']
+        ax1.set_title(f"Gráfico de Candlestick para {ticker} (Período: {candlestick_period} {'dia' if candlestick_period == 1 else 'dias'})", color='#d4d4d4')
+
+        # Todos os indicadores ativos são calculados de uma vez
+        specs = Plotter.indicator_specs(settings, medias, show_ifr, show_macd, show_bandas_bollinger, show_estocastico_normal, show_estocastico_lento)
+        values = indicators.memo.compute_frame(data, specs)
+        series = {name: column.to_numpy() for name, column in values.items()}
+        series['Volume'] = data['Volume'].to_numpy(dtype=float)
+
+        data_key = (indicators.fingerprint(data), 0.6 if trading_days else 0.6 * candlestick_period)
+        data_changed = data_key != self.data_key
+        if data_changed:
+            self._set_bars(data, data_key[1], keep_view)
+            self.data_key = data_key
+        self.data = data
+
+        wanted = {name: specs.get(OVERLAYS[name][1], ()) for name in medias}
+        if show_bandas_bollinger:
+            wanted['bollinger'] = specs['bollinger']
+        for pane in panes:
+            wanted[pane] = specs.get(OVERLAYS[pane][1], ())
+
+        changed = rebuilt
+        for name in list(self.overlays):
+            if name not in wanted:
+                self._remove_overlay(name)
+                changed = True
+        arranged = panes != self.panes
+        if arranged:
+            self._arrange_panes(panes)
+            changed = True
+        for name, params in wanted.items():
+            key = (self.data_key, params)
+            if name not in self.overlays:
+                self.overlays[name] = (key, self._draw_overlay(name, series))
+                changed = True
+            elif self.overlays[name][0] != key:
+                self.overlays[name] = (key, self._update_overlay(name, self.overlays[name][1], series))
+
+        self._fit_y(data, series)
+        if changed:
+            for ax in self.axes.values():
+                Plotter._update_legend(ax)
+
+        # Zoom, arraste e mira ficam no controlador do canvas, conectado uma única vez
+        if self.interaction is not None:
+            axes = [ax1] + [self.axes[pane] for pane in self.panes]
+            self.interaction.attach(axes, self.positions, data, values, self.detail)
+
+        relayout = arranged or rebuilt
+        # Com keep_view (histórico anexado à esquerda) a janela visível não muda e basta um draw_idle
+        if self.runner is not None and settings.get('threaded_render', True) and (relayout or (data_changed and not keep_view)):
+            # Redesenhos completos (layout e rasterização) saem da thread da interface
+            self.canvas.render(self.runner, prepare=lambda: self._prepare_draw(relayout))
+            return
+        self._prepare_draw(relayout)
+        if rebuilt:
+            self.canvas.draw()
+        else:
+            self.canvas.draw_idle()
+
+    def _prepare_draw(self, relayout):
+        if relayout:
+            if self.detail is not None:
+                # A legenda com loc='best' percorre todos os pontos desenhados durante o layout
+                self.detail.refresh()
+            self.canvas.figure.tight_layout()
+        # Depois do layout, para usar a largura final dos eixos
+        if self.detail is not None:
+            self.detail.refresh()
+
+    def _build_axes(self, use_lod, trading_days):
+        figure = self.canvas.figure
+        figure.clear()
+        figure.patch.set_facecolor('#252525')  # Set background color
+        ax1 = figure.add_subplot(gridspec.GridSpec(1, 1, figure=figure)[0])
+        self.axes = {'price': ax1}
+        self.panes = ()
+
+        Plotter._style_axes(ax1, "", "Preço")
+        ax1.grid(True, color='#333')
+        if trading_days:
+            # O formatador com as datas é definido junto com os dados, em _set_bars
+            ax1.xaxis.set_major_locator(MaxNLocator(10, integer=True))
+        else:
+            ax1.xaxis_date()
+            ax1.xaxis.set_major_locator(MaxNLocator(10))
+
+        # Com o nível de detalhe ativo, só a janela visível é desenhada, com no máximo um candle por pixel
+        self.detail = lod.ChartLOD(ax1) if use_lod else None
+        self.layout = (use_lod, trading_days)
+        self.candle_artists = None
+        self.data_key = None
+        self.overlays = {}
+
+    def _arrange_panes(self, panes):
+        # Eixos de painéis que saíram são removidos; os que continuam só mudam de posição
+        figure = self.canvas.figure
+        for pane in self.panes:
+            if pane not in panes:
+                self.axes.pop(pane).remove()
+
+        ax1 = self.axes['price']
+        gs = gridspec.GridSpec(1 + len(panes), 1, height_ratios=[3] + [1] * len(panes), figure=figure)
+        ax1.set_subplotspec(gs[0])
+        for row, pane in enumerate(panes, start=1):
+            if pane in self.axes:
+                self.axes[pane].set_subplotspec(gs[row])
+                continue
+            ax = figure.add_subplot(gs[row], sharex=ax1)
+            Plotter._style_axes(ax, *PANE_TITLES[pane])
+            for level, color, label in PANE_GUIDES.get(pane, ()):
+                ax.axhline(level, color=color, linestyle='--', label=label)
+            if pane in PANE_LIMITS:
+                ax.set_ylim(*PANE_LIMITS[pane])
+            self.axes[pane] = ax
+
+        # Só o eixo de baixo mostra as datas
+        stacked = [ax1] + [self.axes[pane] for pane in panes]
+        for ax in stacked:
+            ax.tick_params(axis='x', labelbottom=ax is stacked[-1], labelrotation=45)
+        self.panes = panes
+
+    def _set_bars(self, data, width, keep_view=False):
+        ax1 = self.axes['price']
+        trading_days = self.layout[1]
+        if trading_days:
+            self.positions = candles.index_positions(data.index)
+            ax1.xaxis.set_major_formatter(candles.TradingDayFormatter(data.index))
+            if keep_view and self.data is not None:
+                # Barras anexadas à esquerda deslocam todos os índices; a janela visível acompanha
+                shift = int(data.index.searchsorted(self.data.index[0]))
+                x_min, x_max = ax1.get_xlim()
+                ax1.set_xlim(x_min + shift, x_max + shift)
+                if self.interaction is not None:
+                    self.interaction.shift_pan(shift)
+        else:
+            self.positions = candles.date_positions(data.index)
+        self.width = width
+        # Uma coleção por cor para corpos e pavios, em vez de um retângulo por candle
+        if self.candle_artists is None:
+            self.candle_artists = candles.draw_candles(ax1, self.positions, data['Open'], data['High'], data['Low'], data['Close'], width)
+        else:
+            candles.update_candles(self.candle_artists, self.positions, data['Open'], data['High'], data['Low'], data['Close'], width)
+        if self.detail is not None:
+            self.detail.set_bars(self.positions, data, width)
+            self.detail.set_candles(self.candle_artists)
+        if not keep_view:
+            ax1.set_xlim(self.positions[0] - width, self.positions[-1] + width)
+
+    def _draw_overlay(self, name, series):
+        axes_name, _, parts = OVERLAYS[name]
+        ax = self.axes[axes_name]
+        artists = []
+        for kind, source, style in parts:
+            if kind == 'line':
+                line, = ax.plot(self.positions, series[source], **style)
+                if self.detail is not None:
+                    self.detail.add_line(line, series[source])
+                artists.append(line)
+            elif kind == 'bars':
+                bars = PolyCollection(self._bar_vertices(series[source]), facecolors=style['color'], edgecolors='none',
+                                      alpha=style.get('alpha'), label=style.get('label', '_nolegend_'))
+                ax.add_collection(bars)
+                if self.detail is not None:
+                    self.detail.add_bars(bars, series[source])
+                artists.append(bars)
+            else:
+                lower, upper = source
+                fill = ax.fill_between(self.positions, series[lower], series[upper], **style)
+                if self.detail is not None:
+                    self.detail.add_fill(fill, series[lower], series[upper])
+                artists.append(fill)
+        return artists
+
+    def _update_overlay(self, name, artists, series):
+        axes_name, _, parts = OVERLAYS[name]
+        ax = self.axes[axes_name]
+        updated = []
+        for (kind, source, style), artist in zip(parts, artists):
+            if kind == 'line':
+                if self.detail is not None:
+                    self.detail.add_line(artist, series[source])
+                else:
+                    artist.set_data(self.positions, series[source])
+            elif kind == 'bars':
+                if self.detail is not None:
+                    self.detail.add_bars(artist, series[source])
+                else:
+                    artist.set_verts(self._bar_vertices(series[source]))
+            else:
+                # O polígono do fill_between não tem atualização in-place; só esta parte é refeita
+                if self.detail is not None:
+                    self.detail.remove(artist)
+                artist.remove()
+                lower, upper = source
+                artist = ax.fill_between(self.positions, series[lower], series[upper], **style)
+                if self.detail is not None:
+                    self.detail.add_fill(artist, series[lower], series[upper])
+            updated.append(artist)
+        return updated
+
+    def _remove_overlay(self, name):
+        _, artists = self.overlays.pop(name)
+        for artist in artists:
+            if self.detail is not None:
+                self.detail.remove(artist)
+            artist.remove()
+
+    def _bar_vertices(self, heights):
+        return candles.body_vertices(self.positions, 0.0, np.nan_to_num(heights), self.width)
+
+    def _fit_y(self, data, series):
+        # Coleções não entram no relim(), então os limites vêm direto das séries desenhadas
+        arrays = {axes_name: [] for axes_name in self.axes}
+        arrays['price'] += [data['Low'].to_numpy(), data['High'].to_numpy()]
+        for name in self.overlays:
+            axes_name, _, parts = OVERLAYS[name]
+            for kind, source, _ in parts:
+                arrays[axes_name].extend(series[s] for s in (source if kind == 'fill' else (source,)))
+                if kind == 'bars':
+                    arrays[axes_name].append(np.zeros(1))
+        for axes_name, ax in self.axes.items():
+            if axes_name in PANE_LIMITS:
+                continue
+            limits = _limits(arrays[axes_name])
+            if limits is not None:
+                ax.set_ylim(*limits)
+
+    @staticmethod
+    def _style_axes(ax, title, ylabel):
+        ax.set_facecolor('#1e1e1e')  # Set subplot background color
+        ax.tick_params(axis='x', colors='#d4d4d4')  # Set x-axis tick color
+        ax.tick_params(axis='y', colors='#d4d4d4')  # Set y-axis tick color
+        ax.set_title(title, color='#d4d4d4')
+        ax.set_ylabel(ylabel, color='#d4d4d4')
+        for spine in ax.spines.values():
+            spine.set_color('#333')
+
+    @staticmethod
+    def _update_legend(ax):
+        handles, labels = ax.get_legend_handles_labels()
+        if labels:
+            ax.legend(labelcolor='#d4d4d4', facecolor='#1e1e1e', edgecolor='#333')
+        elif ax.get_legend() is not None:
+            ax.get_legend().remove()
+
+    @staticmethod
+    def visible_panes(show_volume, show_ifr, show_macd, show_estocastico_normal, show_estocastico_lento):
+        flags = dict(ifr=show_ifr, volume=show_volume, macd=show_macd, estocastico_normal=show_estocastico_normal, estocastico_lento=show_estocastico_lento)
+        return tuple(pane for pane in LOWER_PANES if flags[pane])
+
+    @staticmethod
+    def indicator_specs(settings, medias, show_ifr, show_macd, show_bandas_bollinger, show_estocastico_normal, show_estocastico_lento):
+        specs = {}
+        if 'SMA' in medias:
+            specs['sma'] = (settings.ma_period,)
+        if 'EMA' in medias:
+            specs['ema'] = (settings.ema_period,)
+        if 'WMA' in medias:
+            specs['wma'] = (settings.wma_period,)
+        if show_ifr:
+            specs['rsi'] = (settings.rsi_period,)
+        if show_macd:
+            specs['macd'] = (settings.macd_fast_period, settings.macd_slow_period, settings.macd_signal_period)
+        if show_bandas_bollinger:
+            specs['bollinger'] = (settings.ma_period,)
+        if show_estocastico_normal or show_estocastico_lento:
+            specs['stochastic'] = (settings.stochastic_k_period, settings.stochastic_d_period)
+        return specs
+
+def _limits(arrays, margin=0.05):
+    values = np.concatenate([np.asarray(a, dtype=float).ravel() for a in arrays]) if arrays else np.empty(0)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return None
+    low, high = values.min(), values.max()
+    pad = (high - low) * margin or abs(high) * margin or 1.0
+    # Barras partem de zero; o eixo também
+    return (low if low == 0 else low - pad), high + pad
@@ -0,0 +1,258 @@
+import numpy as np
+from matplotlib.lines import Line2D
+
+CROSSHAIR_COLOR = '#888'
+TEXT_COLOR = '#d4d4d4'
+
+# Rótulos dos indicadores mostrados no tooltip
+INDICATOR_LABELS = {
+    'sma': 'SMA',
+    'ema': 'EMA',
+    'wma': 'WMA',
+    'rsi': 'IFR',
+    'macd': 'MACD',
+    'macd_signal': 'Sinal',
+    'bollinger_upper': 'Banda Sup.',
+    'bollinger_lower': 'Banda Inf.',
+    'stochastic_k': '%K',
+    'stochastic_d': '%D',
+}
+
+class ChartInteraction:
+    """
+    Zoom, pan and crosshair for a chart canvas.
+
+    The controller connects to the canvas events once, and plot calls only
+    re-attach it to the new axes, so handlers never pile up. The crosshair
+    and the hover tooltip are animated artists blitted over a cached
+    background; the bar under the cursor is found by binary search on the
+    sorted bar positions, without touching the data layer.
+
+    Zoom and pan change the axis limits, which requires redrawing the axes,
+    so they go through ``draw_idle`` and a burst of scroll or drag events is
+    coalesced into a single draw.
+
+    When the visible window comes within ``edge_margin`` (a fraction of its
+    width) of the first bar, ``on_left_edge`` is called so the owner can load
+    older history in the background and re-attach with the longer series.
+    """
+
+    def __init__(self, canvas, zoom_factor=0.3, edge_margin=0.25):
+        self.canvas = canvas
+        self.zoom_factor = zoom_factor
+        self.edge_margin = edge_margin
+        self.on_left_edge = None
+        self.axes = []
+        self.x_bounds = None
+        self.positions = None
+        self.bars = {}
+        self.dates = None
+        self.overlays = {}
+        self.detail = None
+        self._background = None
+        self._crosshair = []
+        self._readout = None
+        self._pan_start = None
+
+        canvas.mpl_connect('scroll_event', self.on_scroll)
+        canvas.mpl_connect('button_press_event', self.on_press)
+        canvas.mpl_connect('button_release_event', self.on_release)
+        canvas.mpl_connect('motion_notify_event', self.on_motion)
+        canvas.mpl_connect('draw_event', self.on_draw)
+        canvas.mpl_connect('figure_leave_event', lambda event: self.hide_crosshair())
+        canvas.mpl_connect('resize_event', self.on_resize)
+
+    def attach(self, axes, positions, bars, overlays=None, detail=None):
+        """
+        Control ``axes`` (main price axes first) for the given bars.
+
+        Parameters
+        ----------
+        axes : list of matplotlib.axes.Axes
+            Chart axes, the price axes first
+        positions : numpy.ndarray
+            Sorted x position of each bar in data units
+        bars : pandas.DataFrame
+            'Open', 'High', 'Low', 'Close', 'Volume' columns aligned with positions
+        overlays : dict, optional
+            Indicator name -> array aligned with positions, shown in the tooltip
+        detail : lod.ChartLOD, optional
+            Level-of-detail renderer refreshed whenever the x limits change
+        """
+        self.axes = list(axes)
+        self.positions = np.asarray(positions, dtype=float)
+        self.x_bounds = (self.positions[0], self.positions[-1])
+        self.bars = {name: np.asarray(values) for name, values in bars.items()}
+        # Datas vêm do índice, não das posições, que podem ser índices de pregão
+        self.dates = bars.index
+        # overlays pode ser um DataFrame, cujo valor lógico não é definido: compara com None
+        overlays = {} if overlays is None else overlays
+        self.overlays = {name: np.asarray(values) for name, values in overlays.items() if name in INDICATOR_LABELS}
+        self.detail = detail
+        self._background = None
+        # _pan_start fica: com histórico anexado durante o arraste, a posição inicial continua válida
+
+        # Os eixos podem ser os mesmos da chamada anterior; a mira antiga sai antes de criar a nova
+        for artist in self._animated_artists():
+            try:
+                artist.remove()
+            except (ValueError, NotImplementedError):
+                pass  # Já saiu junto com a figura limpa
+        self._crosshair = []
+        for ax in self.axes:
+            vertical = self._crosshair_line(ax, [self.x_bounds[0], self.x_bounds[0]], [0, 1], ax.get_xaxis_transform())
+            horizontal = self._crosshair_line(ax, [0, 1], [0, 0], ax.get_yaxis_transform())
+            self._crosshair.append((ax, vertical, horizontal))
+        main_ax = self.axes[0]
+        self._readout = main_ax.text(0.01, 0.98, '', transform=main_ax.transAxes, va='top', ha='left',
+                                     color=TEXT_COLOR, fontsize=8, family='monospace', animated=True, visible=False,
+                                     bbox=dict(facecolor='#1e1e1e', edgecolor='#333', alpha=0.85))
+
+    @staticmethod
+    def _crosshair_line(ax, xdata, ydata, transform):
+        # Como axvline/axhline, mas com add_artist: a linha não entra nos limites de dados,
+        # então anexar a mira não muda a escala automática dos eixos
+        line = Line2D(xdata, ydata, transform=transform, color=CROSSHAIR_COLOR, linewidth=0.8, linestyle='--',
+                      animated=True, visible=False)
+        ax.add_artist(line)
+        return line
+
+    def on_draw(self, event):
+        # Fundo sem os artistas animados, reaproveitado a cada movimento do mouse
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._blit_animated()
+
+    def on_scroll(self, event):
+        if not self.axes or event.inaxes not in self.axes:
+            return
+        x_min, x_max = self.axes[0].get_xlim()
+        amount = (x_max - x_min) * self.zoom_factor
+        if event.button == 'down':
+            if event.xdata is None:
+                return
+            new_min, new_max = event.xdata - amount, event.xdata + amount
+        else:
+            new_min, new_max = x_min - amount, x_max + amount
+        self.set_xlim(max(self.x_bounds[0], new_min), min(self.x_bounds[1], new_max))
+
+    def on_press(self, event):
+        if event.button == 1 and self.axes and event.inaxes in self.axes:
+            self._pan_start = (event.x, self.axes[0].get_xlim())
+            self.hide_crosshair()
+
+    def on_release(self, event):
+        self._pan_start = None
+
+    def on_motion(self, event):
+        if self._pan_start is not None:
+            self._pan(event)
+        elif self.axes and event.inaxes in self.axes and event.xdata is not None:
+            self.show_crosshair(event)
+        else:
+            self.hide_crosshair()
+
+    def _pan(self, event):
+        start_x, (x_min, x_max) = self._pan_start
+        width_pixels = self.axes[0].bbox.width
+        if width_pixels <= 0 or event.x is None:
+            return
+        shift = (event.x - start_x) * (x_max - x_min) / width_pixels
+        span = x_max - x_min
+        new_min = min(max(self.x_bounds[0], x_min - shift), self.x_bounds[1] - span)
+        self.set_xlim(new_min, new_min + span)
+
+    def set_xlim(self, x_min, x_max):
+        if x_max <= x_min:
+            return
+        self.axes[0].set_xlim(x_min, x_max)
+        if self.detail is not None:
+            self.detail.refresh()
+        self.canvas.draw_idle()
+        if self.on_left_edge is not None and x_min - self.x_bounds[0] < (x_max - x_min) * self.edge_margin:
+            self.on_left_edge()
+
+    def on_resize(self, event):
+        # Mais ou menos pixels mudam quantos candles cabem na janela visível
+        if self.detail is not None:
+            self.detail.refresh()
+
+    def shift_pan(self, offset):
+        # Mantém o arraste em andamento quando as posições das barras são deslocadas
+        if self._pan_start is not None:
+            start_x, (x_min, x_max) = self._pan_start
+            self._pan_start = (start_x, (x_min + offset, x_max + offset))
+
+    def bar_at(self, x):
+        """
+        Index of the bar closest to ``x``, by binary search on the positions.
+        """
+        i = int(np.searchsorted(self.positions, x))
+        if i <= 0:
+            return 0
+        if i >= len(self.positions):
+            return len(self.positions) - 1
+        return i if self.positions[i] - x < x - self.positions[i - 1] else i - 1
+
+    def show_crosshair(self, event):
+        i = self.bar_at(event.xdata)
+        x = self.positions[i]
+        for ax, vertical, horizontal in self._crosshair:
+            vertical.set_xdata([x, x])
+            vertical.set_visible(True)
+            horizontal.set_visible(ax is event.inaxes)
+            if ax is event.inaxes:
+                horizontal.set_ydata([event.ydata, event.ydata])
+        self._readout.set_text(self.format_tooltip(i))
+        self._readout.set_visible(True)
+        self._blit()
+
+    def hide_crosshair(self):
+        if self._readout is None or not self._readout.get_visible():
+            return
+        for _, vertical, horizontal in self._crosshair:
+            vertical.set_visible(False)
+            horizontal.set_visible(False)
+        self._readout.set_visible(False)
+        self._blit()
+
+    def format_tooltip(self, i):
+        bars = self.bars
+        lines = [
+            self.dates[i].strftime('%d/%m/%Y'),
+            f"Abertura: {bars['Open'][i]:.2f}  Máxima: {bars['High'][i]:.2f}",
+            f"Mínima: {bars['Low'][i]:.2f}  Fechamento: {bars['Close'][i]:.2f}",
+            f"Volume: {_format_volume(bars['Volume'][i])}",
+        ]
+        values = [f"{INDICATOR_LABELS[name]}: {series[i]:.2f}" for name, series in self.overlays.items() if not np.isnan(series[i])]
+        for start in range(0, len(values), 2):
+            lines.append("  ".join(values[start:start + 2]))
+        return "\n".join(lines)
+
+    def _animated_artists(self):
+        artists = []
+        for _, vertical, horizontal in self._crosshair:
+            artists.extend((vertical, horizontal))
+        if self._readout is not None:
+            artists.append(self._readout)
+        return artists
+
+    def _blit_animated(self):
+        for artist in self._animated_artists():
+            if artist.get_visible():
+                artist.axes.draw_artist(artist)
+
+    def _blit(self):
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        self._blit_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+def _format_volume(volume):
+    if volume >= 1_000_000_000:
+        return f"{volume / 1_000_000_000:.2f} bi"
+    if volume >= 1_000_000:
+        return f"{volume / 1_000_000:.2f} mi"
+    if volume >= 1_000:
+        return f"{volume / 1_000:.2f} mil"
+    return f"{volume:.0f}"
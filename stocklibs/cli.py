@@ -0,0 +1,222 @@
+"""
+Command-line entry point for batch jobs, with no Qt or GUI imports.
+
+Examples::
+
+    python -m stocklibs.cli fetch PETR4 VALE3 --start 2023-01-01 --end 2024-01-01 --output-dir dados
+    python -m stocklibs.cli indicators --symbols-file b3.txt --sma 20 --macd 12 26 9 --output-dir indicadores
+    python -m stocklibs.cli export PETR4 --output petr4.xlsx
+    python -m stocklibs.cli report PETR4 --output petr4.docx
+    python -m stocklibs.cli fixtures PETR4 VALE3 --output-dir fixtures
+    python -m stocklibs.cli --fixtures fixtures indicators PETR4   # sem rede
+    python -m stocklibs.cli --record sessao.zip report PETR4
+    python -m stocklibs.cli --replay sessao.zip --latency recorded report PETR4
+    python -m stocklibs.cli tickers --refresh
+    python -m stocklibs.cli tickers PETR
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+# Mesmos valores padrão do SettingsManager
+DEFAULT_SPECS = {
+    'sma': (20,),
+    'ema': (20,),
+    'wma': (20,),
+    'rsi': (14,),
+    'macd': (12, 26, 9),
+    'bollinger': (20,),
+    'stochastic': (14, 3),
+}
+
+def _symbols(args):
+    symbols = list(args.symbols)
+    if args.symbols_file:
+        with open(args.symbols_file) as file:
+            symbols += [line.strip() for line in file if line.strip() and not line.startswith('#')]
+    if not symbols:
+        raise SystemExit("Nenhum ticker informado")
+    return [symbol.upper() for symbol in symbols]
+
+def _period(value):
+    # Número de pregões por candle, ou W/M para semanal/mensal
+    return value.upper() if value.upper() in ('W', 'M') else int(value)
+
+def _load(symbol, args):
+    from . import stockdata, resample
+    data = stockdata.fetch(symbol, start_date=args.start, end_date=args.end)
+    data = data[['Open', 'High', 'Low', 'Close', 'Volume']].dropna()
+    return resample.aggregate(data, args.period)
+
+def _write(frame, symbol, args):
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        path = os.path.join(args.output_dir, f"{symbol}.csv")
+        frame.to_csv(path)
+        print(f"{symbol}: {len(frame)} linhas em {path}")
+    else:
+        print(f"== {symbol} ({len(frame)} linhas)")
+        print(frame.tail(args.tail).to_string())
+
+def _prefetch(symbols, args):
+    # Baixa o histórico de todos os tickers em paralelo para o store local; os jobs depois leem do disco
+    from . import stockdata
+    if not stockdata.get_provider().cacheable:
+        return {}
+    _, errors = stockdata.fetch_many(symbols, args.start, args.end, max_workers=args.workers)
+    return errors
+
+def _for_each_symbol(args, job, prefetch=True):
+    # Um ticker com erro não interrompe o lote; o código de saída indica falhas
+    from .stockdata import _normalize_symbol
+    failures = 0
+    symbols = _symbols(args)
+    errors = _prefetch(symbols, args) if prefetch else {}
+    for symbol in symbols:
+        try:
+            if _normalize_symbol(symbol) in errors:
+                raise ValueError(errors[_normalize_symbol(symbol)])
+            job(symbol)
+        except Exception as e:
+            failures += 1
+            print(f"{symbol}: erro: {e}", file=sys.stderr)
+    return 1 if failures else 0
+
+def command_fetch(args):
+    return _for_each_symbol(args, lambda symbol: _write(_load(symbol, args), symbol, args))
+
+def command_indicators(args):
+    from . import indicators
+    specs = {name: tuple(getattr(args, name)) for name in DEFAULT_SPECS if getattr(args, name)}
+    if not specs:
+        specs = DEFAULT_SPECS
+
+    def job(symbol):
+        data = _load(symbol, args)
+        _write(data.join(indicators.compute_frame(data, specs)), symbol, args)
+    return _for_each_symbol(args, job)
+
+def command_export(args):
+    from . import stockdata
+    file_name = args.output or f"{args.symbol.upper()}.xlsx"
+    print(f"Dados salvos em {stockdata.save_data_excel(args.symbol, args.start, args.end, file_name)}")
+    return 0
+
+def command_report(args):
+    from . import stockdata
+    file_name = args.output or f"{args.symbol.upper()}.docx"
+    print(f"Relatório salvo em {stockdata.generate_report(args.symbol.upper(), file_name)}")
+    return 0
+
+def command_fixtures(args):
+    from . import stockdata
+    from .cache import StatementsCache
+    from .providers import write_fixtures
+    directory = args.output_dir or 'fixtures'
+
+    def job(symbol):
+        symbol = stockdata._normalize_symbol(symbol)
+        folder = write_fixtures(stockdata.get_provider(), symbol, directory, args.start, args.end, StatementsCache.STATEMENTS)
+        print(f"{symbol}: fixtures em {folder}")
+    return _for_each_symbol(args, job, prefetch=False)
+
+def command_tickers(args):
+    from .tickers import ticker_index
+    if args.refresh:
+        print(f"{ticker_index.refresh()} tickers baixados da B3")
+    if args.import_csv:
+        print(f"{ticker_index.import_csv(args.import_csv)} tickers importados de {args.import_csv}")
+    if args.text:
+        for ticker in ticker_index.search(args.text, args.limit):
+            print(f"{ticker.symbol:<8} {ticker.kind:<6} {ticker.sector:<30} {ticker.name}")
+    elif not (args.refresh or args.import_csv):
+        print(f"{len(ticker_index)} tickers em {ticker_index.path}")
+    return 0
+
+def _add_range(parser):
+    parser.add_argument('--start', default=(date.today() - timedelta(days=365)).isoformat(), help="Data inicial (AAAA-MM-DD), padrão: um ano atrás")
+    parser.add_argument('--end', default=date.today().isoformat(), help="Data final, exclusiva (AAAA-MM-DD), padrão: hoje")
+
+def _add_batch(parser):
+    parser.add_argument('symbols', nargs='*', help="Tickers, com ou sem o sufixo .SA")
+    parser.add_argument('--symbols-file', help="Arquivo com um ticker por linha")
+    parser.add_argument('--period', type=_period, default=1, help="Pregões por candle, ou W/M (padrão: 1)")
+    parser.add_argument('--output-dir', help="Grava um CSV por ticker nesta pasta em vez de imprimir")
+    parser.add_argument('--tail', type=int, default=5, help="Linhas impressas por ticker sem --output-dir")
+    parser.add_argument('--workers', type=int, default=16, help="Downloads simultâneos (padrão: 16)")
+    _add_range(parser)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m stocklibs.cli', description="Nova Stocks sem interface gráfica")
+    parser.add_argument('--fixtures', metavar='PASTA', help="Lê os dados de fixtures locais em vez do Yahoo Finance (sem rede)")
+    parser.add_argument('--record', metavar='ARQUIVO', help="Grava todas as respostas do provedor neste arquivo .zip")
+    parser.add_argument('--replay', metavar='ARQUIVO', help="Responde com as respostas gravadas com --record (sem rede)")
+    parser.add_argument('--stats', action='store_true', help="Mostra ao final quantas requisições foram feitas e quantas foram aproveitadas de outra em andamento")
+    parser.add_argument('--latency', metavar='SEGUNDOS', help="Latência simulada no --replay: segundos ou 'recorded' (a gravada)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fetch = commands.add_parser('fetch', help="Baixa candles OHLCV")
+    _add_batch(fetch)
+    fetch.set_defaults(func=command_fetch)
+
+    indicators = commands.add_parser('indicators', help="Calcula indicadores técnicos (todos, se nenhum for escolhido)")
+    _add_batch(indicators)
+    indicators.add_argument('--sma', type=int, nargs=1, metavar='PERIODO')
+    indicators.add_argument('--ema', type=int, nargs=1, metavar='PERIODO')
+    indicators.add_argument('--wma', type=int, nargs=1, metavar='PERIODO')
+    indicators.add_argument('--rsi', type=int, nargs=1, metavar='PERIODO')
+    indicators.add_argument('--macd', type=int, nargs=3, metavar=('RAPIDA', 'LENTA', 'SINAL'))
+    indicators.add_argument('--bollinger', type=int, nargs=1, metavar='PERIODO')
+    indicators.add_argument('--stochastic', type=int, nargs=2, metavar=('K', 'D'))
+    indicators.set_defaults(func=command_indicators)
+
+    export = commands.add_parser('export', help="Exporta os candles para XLSX")
+    export.add_argument('symbol')
+    export.add_argument('--output', help="Arquivo de saída (padrão: TICKER.xlsx)")
+    _add_range(export)
+    export.set_defaults(func=command_export)
+
+    report = commands.add_parser('report', help="Gera o relatório inteligente em DOCX")
+    report.add_argument('symbol')
+    report.add_argument('--output', help="Arquivo de saída (padrão: TICKER.docx)")
+    report.set_defaults(func=command_report)
+
+    fixtures = commands.add_parser('fixtures', help="Salva histórico, info e demonstrativos como fixtures locais")
+    _add_batch(fixtures)
+    fixtures.set_defaults(func=command_fixtures)
+
+    tickers = commands.add_parser('tickers', help="Consulta ou atualiza a lista local de tickers da B3")
+    tickers.add_argument('text', nargs='?', help="Início do código ou de uma palavra do nome")
+    tickers.add_argument('--refresh', action='store_true', help="Baixa a lista de instrumentos da B3")
+    tickers.add_argument('--import', dest='import_csv', metavar='ARQUIVO', help="Substitui a lista por um CSV com ticker, nome, setor e tipo")
+    tickers.add_argument('--limit', type=int, default=20)
+    tickers.set_defaults(func=command_tickers)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.fixtures or args.record or args.replay:
+        from . import stockdata
+        from .providers import FixtureProvider, RecordingProvider, ReplayProvider, parse_latency
+        if args.replay:
+            stockdata.set_provider(ReplayProvider(args.replay, parse_latency(args.latency)))
+        else:
+            provider = FixtureProvider(args.fixtures) if args.fixtures else stockdata.get_provider()
+            stockdata.set_provider(RecordingProvider(provider, args.record) if args.record else provider)
+    try:
+        return args.func(args)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.stats:
+            _print_stats()
+
+def _print_stats():
+    from . import stockdata
+    for kind, stats in stockdata.request_stats().items():
+        print(f"{kind}: {stats['calls']} requisições, {stats['coalesced']} aproveitadas", file=sys.stderr)
+
+if __name__ == '__main__':
+    sys.exit(main())
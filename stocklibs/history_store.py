@@ -0,0 +1,154 @@
+import os
+import sys
+import datetime
+import tempfile
+import numpy as np
+import pandas as pd
+
+class HistoryStore:
+    """
+    On-disk OHLCV store with one file per ticker.
+
+    Each file keeps the downloaded bars together with the date range that was
+    already requested from the network (the coverage). Weekends and holidays
+    have no bars, so the coverage, not the first/last index, decides what is
+    missing. Only the head and/or tail outside the coverage is downloaded,
+    and the coverage only grows over a range whose download succeeded (or
+    that has no weekdays at all), so a failed request is retried next time.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or self._get_store_path()
+
+    def _get_store_path(self):
+        # Same base directory as SettingsManager
+        if sys.platform == "win32":
+            return os.path.join(os.getenv('APPDATA'), 'stockanalysis', 'history')
+        else:
+            return os.path.join(os.path.expanduser('~'), '.config', 'stockanalysis', 'history')
+
+    def _path(self, symbol):
+        return os.path.join(self.directory, f"{symbol}.pkl")
+
+    def load(self, symbol):
+        """
+        Return (data, coverage_start, coverage_end) or None if nothing is stored.
+        """
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return None
+        try:
+            entry = pd.read_pickle(path)
+            return entry['data'], entry['start'], entry['end']
+        except Exception as e:
+            print(f"Error loading stored history for {symbol}: {e}")
+            return None
+
+    def save(self, symbol, data, start, end):
+        try:
+            if not os.path.exists(self.directory):
+                os.makedirs(self.directory)
+            # Write to a temporary file first so a crash never leaves a truncated store;
+            # one file per write, since several threads may save the same symbol
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=f"{symbol}.", suffix=".tmp", delete=False) as file:
+                tmp_path = file.name
+            try:
+                pd.to_pickle({'data': data, 'start': start, 'end': end}, tmp_path)
+                os.replace(tmp_path, self._path(symbol))
+            except Exception:
+                os.remove(tmp_path)
+                raise
+        except Exception as e:
+            print(f"Error saving history for {symbol}: {e}")
+
+    def invalidate(self, symbol=None):
+        if symbol is None:
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith(".pkl"):
+                        os.remove(os.path.join(self.directory, name))
+            return
+        path = self._path(symbol)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get(self, symbol, start_date, end_date, downloader):
+        """
+        Return the bars of ``symbol`` in [start_date, end_date).
+
+        Parameters
+        ----------
+        symbol : str
+            Normalized ticker (with the .SA suffix)
+        start_date, end_date : str or date
+            Requested range, end exclusive (same semantics as yfinance)
+        downloader : callable
+            ``downloader(start, end)`` returning a DataFrame for [start, end)
+        """
+        start = _to_date(start_date)
+        end = _to_date(end_date)
+        # Bars for today (or later) are not final yet, never mark them as covered
+        covered_end = min(end, datetime.date.today())
+
+        stored = self.load(symbol)
+        if stored is None:
+            data = downloader(start, end)
+            self.save(symbol, data, start, covered_end)
+            return data
+
+        data, cov_start, cov_end = stored
+        parts = [data]
+        new_start, new_end = cov_start, cov_end
+        if start < cov_start:
+            head = _download_part(downloader, start, cov_start)
+            if head is not None:
+                parts.insert(0, head)
+                new_start = start
+        if end > cov_end:
+            tail = _download_part(downloader, cov_end, end)
+            if tail is not None:
+                parts.append(tail)
+                new_end = max(covered_end, cov_end)
+
+        if len(parts) > 1:
+            data = pd.concat([p for p in parts if not p.empty])
+            # The tail download re-reads the last partial bar, keep the newest copy
+            data = data[~data.index.duplicated(keep='last')].sort_index()
+            self.save(symbol, data, new_start, new_end)
+
+        return slice_range(data, start, end)
+
+def _download_part(downloader, start, end):
+    """
+    Bars in [start, end), an empty frame if the range has no weekdays, or None if the download failed.
+    """
+    if start >= end:
+        return None
+    if np.busday_count(start, end) == 0:
+        # Só fim de semana: não há pregão, nem precisa perguntar ao provedor
+        return pd.DataFrame()
+    try:
+        return downloader(start, end)
+    except ValueError:
+        # Sem barras ou falha de rede/limite de requisições (o yfinance usa o mesmo erro);
+        # a cobertura não cresce, então o trecho é pedido de novo na próxima vez
+        return None
+
+def _to_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.datetime.strptime(str(value), "%Y-%m-%d").date()
+
+def slice_range(data, start, end):
+    """
+    Slice ``data`` to [start, end), handling timezone-aware indexes.
+    """
+    tz = getattr(data.index, 'tz', None)
+    start_ts = pd.Timestamp(start)
+    end_ts = pd.Timestamp(end)
+    if tz is not None:
+        start_ts = start_ts.tz_localize(tz)
+        end_ts = end_ts.tz_localize(tz)
+    return data[(data.index >= start_ts) & (data.index < end_ts)]
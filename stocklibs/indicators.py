@@ -0,0 +1,273 @@
+import math
+import hashlib
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from .cache import CandleCache
+
+# Indicadores disponíveis e os parâmetros esperados por cada um
+INDICATORS = {
+    'sma': ('period',),
+    'ema': ('period',),
+    'wma': ('period',),
+    'rsi': ('period',),
+    'macd': ('fast', 'slow', 'signal'),
+    'bollinger': ('period',),
+    'stochastic': ('k_period', 'd_period'),
+}
+
+# Séries devolvidas por cada indicador
+OUTPUTS = {
+    'sma': ('sma',),
+    'ema': ('ema',),
+    'wma': ('wma',),
+    'rsi': ('rsi',),
+    'macd': ('macd', 'macd_signal', 'macd_hist'),
+    'bollinger': ('bollinger_mid', 'bollinger_upper', 'bollinger_lower'),
+    'stochastic': ('stochastic_k', 'stochastic_d'),
+}
+
+def compute(high, low, close, specs):
+    """
+    Compute a set of indicators over raw float arrays in one pass.
+
+    Parameters
+    ----------
+    high, low, close : array-like
+        Price arrays of the same length
+    specs : dict
+        Indicator name (see INDICATORS) -> tuple of parameters,
+        e.g. {'sma': (20,), 'macd': (12, 26, 9)}
+
+    Returns
+    -------
+    dict
+        Output name -> numpy array aligned with ``close``. Leading values
+        without a full window are NaN, like pandas rolling windows.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    # Resultados intermediários compartilhados entre indicadores (ex.: SMA e Bollinger)
+    shared = {}
+
+    def cached(key, func, *args):
+        if key not in shared:
+            shared[key] = func(*args)
+        return shared[key]
+
+    results = {}
+    for name, params in specs.items():
+        if name not in INDICATORS:
+            raise ValueError(f"Indicador desconhecido: {name}")
+        if name == 'sma':
+            results['sma'] = cached(('sma', params[0]), sma, close, params[0])
+        elif name == 'ema':
+            results['ema'] = cached(('ema', params[0]), ema, close, params[0])
+        elif name == 'wma':
+            results['wma'] = wma(close, params[0])
+        elif name == 'rsi':
+            results['rsi'] = rsi(close, params[0])
+        elif name == 'macd':
+            fast, slow, signal = params
+            line = cached(('ema', fast), ema, close, fast) - cached(('ema', slow), ema, close, slow)
+            signal_line = ema(line, signal)
+            results['macd'] = line
+            results['macd_signal'] = signal_line
+            results['macd_hist'] = line - signal_line
+        elif name == 'bollinger':
+            period = params[0]
+            middle = cached(('sma', period), sma, close, period)
+            deviation = rolling_std(close, period)
+            results['bollinger_mid'] = middle
+            results['bollinger_upper'] = middle + 2 * deviation
+            results['bollinger_lower'] = middle - 2 * deviation
+        elif name == 'stochastic':
+            k_period, d_period = params
+            k = cached(('stochastic_k', k_period), stochastic_k, high, low, close, k_period)
+            results['stochastic_k'] = k
+            results['stochastic_d'] = sma(k, d_period)
+    return results
+
+def compute_frame(data, specs):
+    """
+    Same as compute(), taking an OHLC DataFrame and returning a DataFrame
+    indexed like ``data``.
+    """
+    results = compute(data['High'].to_numpy(), data['Low'].to_numpy(), data['Close'].to_numpy(), specs)
+    return pd.DataFrame(results, index=data.index)
+
+def _leading_nan(values, count):
+    # Valores sem janela completa ficam NaN, igual ao rolling do pandas
+    out = np.full(len(values) + count, np.nan)
+    out[count:] = values
+    return out
+
+def _first_valid(x):
+    valid = np.flatnonzero(~np.isnan(x))
+    return valid[0] if len(valid) else len(x)
+
+def _window_sums(x, period):
+    """
+    Sum of each full window with cumulative sums, and how many NaNs it contains.
+
+    NaNs count as zero in the sums, so one NaN only spoils the windows that
+    actually contain it (like pandas rolling), not everything after it.
+    """
+    missing = np.isnan(x)
+    csum = np.cumsum(np.r_[0.0, np.where(missing, 0.0, x)])
+    cmissing = np.cumsum(np.r_[0, missing])
+    return csum[period:] - csum[:-period], cmissing[period:] - cmissing[:-period]
+
+def sma(x, period):
+    """
+    Simple moving average with cumulative sums, O(n) for any window.
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) < period:
+        return np.full(len(x), np.nan)
+    window_sum, window_missing = _window_sums(x, period)
+    values = window_sum / period
+    values[window_missing > 0] = np.nan
+    return _leading_nan(values, period - 1)
+
+def rolling_std(x, period):
+    """
+    Rolling sample standard deviation (ddof=1) with cumulative sums.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n < period or period < 2 or _first_valid(x) == n:
+        return np.full(n, np.nan)
+    # Centralizar reduz o cancelamento numérico de E[x²] - E[x]²
+    centered = x - np.nanmean(x)
+    window_sum, window_missing = _window_sums(centered, period)
+    window_sum2, _ = _window_sums(centered * centered, period)
+    variance = (window_sum2 - window_sum * window_sum / period) / (period - 1)
+    values = np.sqrt(np.maximum(variance, 0.0))
+    # Janela com todos os valores iguais tem desvio exatamente zero, como no pandas;
+    # pelas somas acumuladas sobraria o erro de arredondamento
+    changes = np.cumsum(np.r_[0.0, 0.0, np.diff(x) != 0])
+    values[changes[period:] - changes[1:n - period + 2] == 0] = 0.0
+    values[window_missing > 0] = np.nan
+    return _leading_nan(values, period - 1)
+
+def ema(x, span):
+    """
+    Exponential moving average equivalent to ``ewm(span=span, adjust=False)``.
+
+    The recursion y[t] = a*x[t] + (1-a)*y[t-1] is solved in blocks with a
+    scaled cumulative sum, so the work stays in NumPy instead of a Python loop.
+    """
+    x = np.asarray(x, dtype=float)
+    out = np.full(len(x), np.nan)
+    start = _first_valid(x)
+    if start >= len(x):
+        return out
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    if decay == 0.0:
+        out[start:] = x[start:]
+        return out
+
+    # Tamanho do bloco para que decay ** -block não estoure o float
+    block = max(1, int(200.0 / -math.log(decay)))
+    # Com y[-1] = x[0] a recursão dá y[0] = x[0], como no pandas com adjust=False
+    previous = x[start]
+    position = start
+    while position < len(x):
+        chunk = x[position:position + block]
+        # y[p + i] = decay^(i+1) * (y[p-1] + alpha * sum(x[p + k] / decay^(k+1)))
+        powers = decay ** np.arange(1, len(chunk) + 1)
+        values = powers * (previous + alpha * np.cumsum(chunk / powers))
+        out[position:position + len(chunk)] = values
+        previous = values[-1]
+        position += len(chunk)
+    return out
+
+def wma(x, period):
+    """
+    Weighted moving average by convolution. Matches the previous definition,
+    ``np.average(window, weights=np.arange(period, 0, -1))``.
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) < period:
+        return np.full(len(x), np.nan)
+    kernel = np.arange(1, period + 1, dtype=float)
+    values = np.convolve(x, kernel, mode='valid') / kernel.sum()
+    return _leading_nan(values, period - 1)
+
+def rsi(close, period):
+    """
+    Relative strength index (IFR) with simple averages of gains and losses.
+    """
+    close = np.asarray(close, dtype=float)
+    # O primeiro delta conta como zero, como em delta.where(delta > 0, 0) no pandas
+    delta = np.r_[0.0, np.diff(close)]
+    gain = sma(np.where(delta > 0, delta, 0.0), period)
+    loss = sma(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+def stochastic_k(high, low, close, period):
+    """
+    Fast stochastic %K.
+    """
+    close = np.asarray(close, dtype=float)
+    if len(close) < period:
+        return np.full(len(close), np.nan)
+    lowest = _leading_nan(sliding_window_view(np.asarray(low, dtype=float), period).min(axis=1), period - 1)
+    highest = _leading_nan(sliding_window_view(np.asarray(high, dtype=float), period).max(axis=1), period - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 * ((close - lowest) / (highest - lowest))
+
+def fingerprint(data):
+    """
+    Digest of the index and OHLC values of ``data``; changes whenever the
+    underlying series changes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(data.index.asi8).tobytes())
+    for column in ('High', 'Low', 'Close'):
+        digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+class IndicatorMemo:
+    """
+    Memoized indicator results keyed by (series fingerprint, indicator, parameters).
+
+    Toggling an overlay, undoing or reopening a ticker reuses the arrays that
+    were already computed; a new key only appears when the data or the
+    relevant setting changes. Old entries are evicted by memory (LRU).
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.cache = CandleCache(max_bytes)
+
+    def compute(self, key, high, low, close, specs):
+        results = {}
+        missing = {}
+        for name, params in specs.items():
+            cached = self.cache.get((key, name, tuple(params)))
+            if cached is None:
+                missing[name] = params
+            else:
+                results.update(cached)
+
+        if missing:
+            computed = compute(high, low, close, missing)
+            for name, params in missing.items():
+                outputs = {output: computed[output] for output in OUTPUTS[name]}
+                self.cache[(key, name, tuple(params))] = outputs
+                results.update(outputs)
+        return results
+
+    def compute_frame(self, data, specs):
+        results = self.compute(fingerprint(data), data['High'].to_numpy(), data['Low'].to_numpy(), data['Close'].to_numpy(), specs)
+        return pd.DataFrame(results, index=data.index)
+
+    def clear(self):
+        self.cache.clear()
+
+# Memo compartilhado pelo gráfico principal
+memo = IndicatorMemo()
@@ -0,0 +1,179 @@
+import numpy as np
+from .resample import reduce_ohlcv
+from .candles import update_candles, body_vertices
+
+def downsample_ohlcv(positions, open_, high, low, close, volume, max_bars):
+    """
+    Aggregate consecutive bars so that at most ``max_bars`` remain.
+
+    The aggregation is OHLC-correct (first/max/min/last/sum), so highs and
+    lows are never lost, unlike plain decimation.
+
+    Returns
+    -------
+    tuple
+        (positions, open, high, low, close, volume, group_size); positions
+        are the centers of each group
+    """
+    n = len(positions)
+    if n <= max_bars:
+        return positions, open_, high, low, close, volume, 1
+    group = int(np.ceil(n / max_bars))
+    starts = np.arange(0, n, group)
+    ends = np.r_[starts[1:], n] - 1
+    centers = (positions[starts] + positions[ends]) / 2
+    return (centers, *reduce_ohlcv(open_, high, low, close, volume, starts), group)
+
+def minmax_envelope(x, y, max_buckets):
+    """
+    Decimate a line to the min and max of each of ``max_buckets`` buckets.
+
+    Each bucket becomes a vertical stroke at its center, so spikes stay
+    visible at any zoom level. NaN values (indicator warm-up) are ignored.
+    """
+    n = len(x)
+    if n <= 2 * max_buckets:
+        return x, y
+    group = int(np.ceil(n / max_buckets))
+    starts = np.arange(0, n, group)
+    ends = np.r_[starts[1:], n] - 1
+    centers = (x[starts] + x[ends]) / 2
+    with np.errstate(invalid='ignore'):
+        lows = np.fmin.reduceat(y, starts)
+        highs = np.fmax.reduceat(y, starts)
+    xs = np.repeat(centers, 2)
+    ys = np.empty(2 * len(starts))
+    ys[0::2] = lows
+    ys[1::2] = highs
+    return xs, ys
+
+def minmax_bars(x, y, max_buckets):
+    """
+    Reduce bars (volume, MACD histogram) to one per bucket of consecutive bars.
+
+    Each bucket's bar spans from min(0, lowest) to max(0, highest), so the
+    tallest bar in either direction survives, and the y range matches the
+    full-resolution bars.
+
+    Returns
+    -------
+    tuple
+        (positions, bottoms, tops, group_size)
+    """
+    n = len(x)
+    if n <= max_buckets:
+        y = np.nan_to_num(y)
+        return x, np.minimum(y, 0.0), np.maximum(y, 0.0), 1
+    group = int(np.ceil(n / max_buckets))
+    starts = np.arange(0, n, group)
+    ends = np.r_[starts[1:], n] - 1
+    centers = (x[starts] + x[ends]) / 2
+    with np.errstate(invalid='ignore'):
+        lows = np.nan_to_num(np.fmin.reduceat(y, starts))
+        highs = np.nan_to_num(np.fmax.reduceat(y, starts))
+    return centers, np.minimum(lows, 0.0), np.maximum(highs, 0.0), group
+
+def band_polygons(x, lower, upper, max_buckets):
+    """
+    Vertices of the area between ``lower`` and ``upper`` (e.g. the Bollinger
+    bands), decimated to the lowest lower and highest upper value of each of
+    ``max_buckets`` buckets.
+
+    Like fill_between, there is one polygon per run of valid values, so the
+    NaN warm-up of the indicator is left empty.
+    """
+    n = len(x)
+    if n > max_buckets:
+        group = int(np.ceil(n / max_buckets))
+        starts = np.arange(0, n, group)
+        ends = np.r_[starts[1:], n] - 1
+        x = (x[starts] + x[ends]) / 2
+        with np.errstate(invalid='ignore'):
+            lower = np.fmin.reduceat(lower, starts)
+            upper = np.fmax.reduceat(upper, starts)
+    valid = np.isfinite(lower) & np.isfinite(upper)
+    edges = np.diff(np.r_[0, valid.astype(np.int8), 0])
+    polygons = []
+    for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        xs = x[start:end]
+        polygons.append(np.column_stack((np.r_[xs, xs[::-1]], np.r_[upper[start:end], lower[start:end][::-1]])))
+    return polygons
+
+class ChartLOD:
+    """
+    Level-of-detail renderer for the visible window of a chart.
+
+    Keeps the full-resolution arrays and, on every refresh, redraws only the
+    bars inside the x limits, aggregated to at most one candle per pixel
+    column. Indicator lines get the min/max envelope treatment, volume and
+    histogram bars keep the extreme of each bucket, and filled bands the
+    outer edges. The number of drawn primitives is therefore bounded by the
+    axes width, not the history length.
+    """
+
+    def __init__(self, ax, bars_per_pixel=1.0):
+        self.ax = ax
+        self.bars_per_pixel = bars_per_pixel
+        self.positions = None
+        self.bars = {}
+        self.width = None
+        self.candle_artists = None
+        self.lines = {}  # linha -> y em resolução completa
+        self.bar_collections = {}  # coleção -> alturas em resolução completa
+        self.fills = {}  # polígono -> (inferior, superior) em resolução completa
+
+    def set_bars(self, positions, bars, width):
+        self.positions = np.asarray(positions, dtype=float)
+        self.bars = {name: np.asarray(bars[name], dtype=float) for name in ('Open', 'High', 'Low', 'Close', 'Volume')}
+        self.width = width
+
+    def set_candles(self, artists):
+        self.candle_artists = artists
+
+    def add_line(self, line, y):
+        # Chamar de novo para a mesma linha substitui os dados dela
+        self.lines[line] = np.asarray(y, dtype=float)
+
+    def add_bars(self, collection, heights):
+        self.bar_collections[collection] = np.asarray(heights, dtype=float)
+
+    def add_fill(self, collection, lower, upper):
+        self.fills[collection] = (np.asarray(lower, dtype=float), np.asarray(upper, dtype=float))
+
+    def remove(self, artist):
+        self.lines.pop(artist, None)
+        self.bar_collections.pop(artist, None)
+        self.fills.pop(artist, None)
+
+    def visible_range(self):
+        x_min, x_max = self.ax.get_xlim()
+        # Uma barra a mais de cada lado para as linhas não terminarem antes da borda
+        lo = max(0, int(np.searchsorted(self.positions, x_min, side='left')) - 1)
+        hi = min(len(self.positions), int(np.searchsorted(self.positions, x_max, side='right')) + 1)
+        return lo, hi
+
+    def refresh(self):
+        if self.positions is None or len(self.positions) == 0:
+            return
+        lo, hi = self.visible_range()
+        if hi <= lo:
+            return
+        max_bars = max(1, int(self.ax.bbox.width * self.bars_per_pixel))
+        bars = self.bars
+
+        if self.candle_artists is not None:
+            x, open_, high, low, close, _, group = downsample_ohlcv(
+                self.positions[lo:hi], bars['Open'][lo:hi], bars['High'][lo:hi],
+                bars['Low'][lo:hi], bars['Close'][lo:hi], bars['Volume'][lo:hi], max_bars
+            )
+            update_candles(self.candle_artists, x, open_, high, low, close, self.width * group)
+
+        for line, y in self.lines.items():
+            line.set_data(*minmax_envelope(self.positions[lo:hi], y[lo:hi], max_bars))
+
+        for collection, heights in self.bar_collections.items():
+            x, bottoms, tops, group = minmax_bars(self.positions[lo:hi], heights[lo:hi], max_bars)
+            collection.set_verts(body_vertices(x, bottoms, tops, self.width * group))
+
+        for collection, (lower, upper) in self.fills.items():
+            collection.set_verts(band_polygons(self.positions[lo:hi], lower[lo:hi], upper[lo:hi], max_bars))
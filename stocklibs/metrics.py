@@ -1,16 +1,17 @@
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
-                                 QLineEdit, QScrollArea, QLabel)
-import yfinance as yf
+                                 QLineEdit, QScrollArea, QLabel, QMessageBox)
 from PySide6.QtCore import Qt
 from .stockdata import (fetch_stock_data, fetch_monthly_financials, convert_to_brl_naturallanguage)
 from . import stockdata
 from .assets import styles
+from .workers import TaskRunner
 
 class MetricsWindow(QMainWindow):
     def __init__(self, ticker=None):
         super().__init__()
         self.setStyleSheet(styles.light_mode)
         self.ticker = ticker
+        self.task_runner = TaskRunner(self)
         self.setup_ui()
         if ticker:
             self.load_data()
@@ -66,7 +67,18 @@ class MetricsWindow(QMainWindow):
         if not self.ticker:
             return
 
-        ticker = self.ticker + ".SA" if not self.ticker.endswith(".SA") else self.ticker
+        # A rede fica em segundo plano; a janela é preenchida quando os dados chegam
+        self.task_runner.submit(
+            'metrics',
+            self.fetch_data,
+            self.ticker,
+            on_result=self.show_data,
+            on_error=lambda message: QMessageBox.warning(self, "Erro", f"Erro ao carregar métricas: {message}")
+        )
+
+    @staticmethod
+    def fetch_data(ticker):
+        ticker = ticker + ".SA" if not ticker.endswith(".SA") else ticker
         
         # Fetch all data
         stock_data = fetch_stock_data(ticker.upper())
@@ -80,6 +92,11 @@ class MetricsWindow(QMainWindow):
         debt_to_ebitda = stockdata.fetch_debt_to_ebitda(ticker.upper())
         net_margin = stockdata.fetch_net_margin(ticker.upper())
 
+        return stock_data, financial_data, pvp, pe, roe, dividend_yield, debt_to_ebitda, net_margin
+
+    def show_data(self, fetched):
+        stock_data, financial_data, pvp, pe, roe, dividend_yield, debt_to_ebitda, net_margin = fetched
+
         # Retrieve key financial data
         shares_outstanding = stock_data['sharesOutstanding']  # Ações em circulação
         equity = stock_data['equity']
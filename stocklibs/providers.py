@@ -0,0 +1,310 @@
+import os
+import json
+import time
+import io
+import datetime
+import zipfile
+import threading
+import pandas as pd
+
+# Períodos relativos aceitos por history(period=...), como no yfinance
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    'max': None,
+}
+
+class Provider:
+    """
+    Source of market data: price history, the info snapshot and the
+    financial statements of a symbol.
+
+    Symbols are already normalized (with the .SA suffix). ``cacheable`` tells
+    the data layer whether history may be kept in the on-disk history store;
+    offline backends turn it off so runs stay deterministic.
+    """
+
+    name = None
+    cacheable = True
+    # Servidor consultado, para limitar requisições simultâneas; None para fontes locais
+    host = None
+
+    def history(self, symbol, start=None, end=None, period=None):
+        """
+        Daily OHLCV bars in [start, end), or for a relative ``period`` (see PERIOD_OFFSETS).
+        """
+        raise NotImplementedError
+
+    def info(self, symbol):
+        """
+        Dictionary with quote, valuation and company fields, as in ``yf.Ticker.info``.
+        """
+        raise NotImplementedError
+
+    def statement(self, symbol, name):
+        """
+        One financial statement (see StatementsCache.STATEMENTS) as a DataFrame.
+        """
+        raise NotImplementedError
+
+class YFinanceProvider(Provider):
+    """
+    Yahoo Finance backend.
+    """
+
+    name = 'yfinance'
+    host = 'finance.yahoo.com'
+
+    def _ticker(self, symbol):
+        # yfinance só é importado na primeira consulta, não ao abrir a janela principal
+        import yfinance as yf
+        return yf.Ticker(symbol)
+
+    def history(self, symbol, start=None, end=None, period=None):
+        if period is not None:
+            return self._ticker(symbol).history(period=period)
+        return self._ticker(symbol).history(start=start, end=end)
+
+    def info(self, symbol):
+        return self._ticker(symbol).info
+
+    def statement(self, symbol, name):
+        return getattr(self._ticker(symbol), name)
+
+def read_csv_frame(source, parse_index):
+    """
+    Read a history (``parse_index``: Date index in B3 time) or statement
+    (period dates as columns) frame written with ``DataFrame.to_csv``.
+    """
+    frame = pd.read_csv(source, index_col=0)
+    if parse_index:
+        frame.index = pd.to_datetime(frame.index, utc=True).tz_convert('America/Sao_Paulo')
+        frame.index.name = 'Date'
+    else:
+        # Colunas dos demonstrativos são as datas de cada período
+        frame.columns = pd.to_datetime(frame.columns)
+    return frame
+
+class FixtureProvider(Provider):
+    """
+    Offline backend serving Parquet or CSV fixtures from disk.
+
+    Layout, one folder per symbol::
+
+        {directory}/PETR4.SA/history.parquet   (or history.csv, Date index)
+        {directory}/PETR4.SA/info.json
+        {directory}/PETR4.SA/quarterly_financials.parquet   (or .csv)
+
+    Missing files behave like an unknown symbol on Yahoo: empty history or
+    statement, empty info. Files are read once and kept in memory.
+    """
+
+    name = 'fixtures'
+    cacheable = False
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._frames = {}
+
+    def _read_frame(self, symbol, name, parse_index):
+        key = (symbol, name)
+        if key not in self._frames:
+            base = os.path.join(self.directory, symbol, name)
+            if os.path.exists(base + '.parquet'):
+                frame = pd.read_parquet(base + '.parquet')
+            elif os.path.exists(base + '.csv'):
+                frame = read_csv_frame(base + '.csv', parse_index)
+            else:
+                frame = pd.DataFrame()
+            self._frames[key] = frame
+        return self._frames[key]
+
+    def history(self, symbol, start=None, end=None, period=None):
+        # Sempre uma cópia: quem chama pode alterar o resultado, e o frame em memória serve as próximas chamadas
+        data = self._read_frame(symbol, 'history', parse_index=True)
+        if data.empty or (period is None and start is None and end is None):
+            return data.copy()
+        if period is not None:
+            if period not in PERIOD_OFFSETS:
+                raise ValueError(f"Período inválido: {period}")
+            offset = PERIOD_OFFSETS[period]
+            return data.copy() if offset is None else data[data.index > data.index[-1] - offset].copy()
+        from .history_store import slice_range
+        return slice_range(data, start or data.index[0].date(), end or data.index[-1].date() + datetime.timedelta(days=1)).copy()
+
+    def info(self, symbol):
+        path = os.path.join(self.directory, symbol, 'info.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path) as file:
+            return json.load(file)
+
+    def statement(self, symbol, name):
+        return self._read_frame(symbol, name, parse_index=False).copy()
+
+def _archive_key(method, symbol, *args):
+    # Nome do membro no arquivo zip, ex.: history/PETR4.SA/2024-01-01_2024-06-01_None
+    key = f"{method}/{symbol}"
+    return key + "/" + "_".join(str(arg) for arg in args) if args else key
+
+def _recorded_keys(archive):
+    return {name[:-len('.json')] for name in archive.namelist() if name.endswith('.json')}
+
+class RecordingProvider(Provider):
+    """
+    Wraps another provider and saves every response of the session to a zip archive.
+
+    Each call gets a compressed JSON member with the time it took and the
+    error raised, if any (type name and message only); DataFrames go to a
+    CSV member next to it and the info dict into the JSON itself. A
+    ReplayProvider can then serve the same inputs later, optionally with the
+    original latency. Nothing in the archive is executable, so captures from
+    other machines are safe to replay. Members are appended as they arrive;
+    a call repeated with the same arguments keeps the first response.
+
+    History is not kept in the on-disk history store while recording, so
+    every range the application asks for reaches the provider and the
+    archive.
+    """
+
+    name = 'recording'
+    cacheable = False
+
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self.host = inner.host
+        self._lock = threading.Lock()
+        self._recorded = set()
+        if os.path.exists(path):
+            with zipfile.ZipFile(path) as archive:
+                self._recorded = _recorded_keys(archive)
+
+    def _record(self, key, call):
+        start = time.perf_counter()
+        try:
+            result, error = call(), None
+        except Exception as e:
+            result, error = None, e
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            if key not in self._recorded:
+                entry = {'elapsed': elapsed, 'error': None, 'frame': isinstance(result, pd.DataFrame), 'result': None}
+                if error is not None:
+                    entry['error'] = {'type': type(error).__name__, 'message': str(error)}
+                elif not entry['frame']:
+                    entry['result'] = result
+                with zipfile.ZipFile(self.path, 'a', compression=zipfile.ZIP_DEFLATED) as archive:
+                    if entry['frame']:
+                        archive.writestr(key + '.csv', result.to_csv())
+                    # O JSON vai por último: é ele que marca a resposta como gravada
+                    archive.writestr(key + '.json', json.dumps(entry, default=str))
+                self._recorded.add(key)
+        if error is not None:
+            raise error
+        return result
+
+    def history(self, symbol, start=None, end=None, period=None):
+        return self._record(_archive_key('history', symbol, start, end, period),
+                            lambda: self.inner.history(symbol, start=start, end=end, period=period))
+
+    def info(self, symbol):
+        return self._record(_archive_key('info', symbol), lambda: self.inner.info(symbol))
+
+    def statement(self, symbol, name):
+        return self._record(_archive_key('statement', symbol, name), lambda: self.inner.statement(symbol, name))
+
+class ReplayProvider(Provider):
+    """
+    Serves the responses saved by a RecordingProvider.
+
+    Parameters
+    ----------
+    path : str
+        Archive written by RecordingProvider
+    latency : float or 'recorded', optional
+        Simulated latency per call: a fixed number of seconds, or 'recorded'
+        to sleep as long as the original call took. None (default) answers
+        immediately.
+    """
+
+    name = 'replay'
+    cacheable = False
+
+    def __init__(self, path, latency=None):
+        self.path = path
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._archive = zipfile.ZipFile(path)
+        self._recorded = _recorded_keys(self._archive)
+
+    def _replay(self, key, parse_index=False):
+        if key not in self._recorded:
+            raise ValueError(f"Resposta não gravada: {key}")
+        with self._lock:
+            entry = json.loads(self._archive.read(key + '.json'))
+            csv = self._archive.read(key + '.csv') if entry['frame'] else None
+        if self.latency == 'recorded':
+            time.sleep(entry['elapsed'])
+        elif self.latency:
+            time.sleep(self.latency)
+        if entry['error'] is not None:
+            # Só o tipo e a mensagem são gravados; o erro volta como ValueError, como o de um ticker inválido
+            error = entry['error']
+            raise ValueError(error['message'] if error['type'] == 'ValueError' else f"{error['type']}: {error['message']}")
+        if csv is not None:
+            return read_csv_frame(io.BytesIO(csv), parse_index)
+        return entry['result']
+
+    def history(self, symbol, start=None, end=None, period=None):
+        return self._replay(_archive_key('history', symbol, start, end, period), parse_index=True)
+
+    def info(self, symbol):
+        return self._replay(_archive_key('info', symbol))
+
+    def statement(self, symbol, name):
+        return self._replay(_archive_key('statement', symbol, name))
+
+def parse_latency(value):
+    # 'recorded' usa o tempo gravado de cada chamada; um número é um atraso fixo em segundos
+    if not value:
+        return None
+    return value if value == 'recorded' else float(value)
+
+def write_fixtures(provider, symbol, directory, start, end, statements=()):
+    """
+    Save what ``provider`` returns for ``symbol`` in the FixtureProvider layout (CSV and JSON).
+    """
+    folder = os.path.join(directory, symbol)
+    os.makedirs(folder, exist_ok=True)
+    provider.history(symbol, start=start, end=end).to_csv(os.path.join(folder, 'history.csv'))
+    with open(os.path.join(folder, 'info.json'), 'w') as file:
+        json.dump(provider.info(symbol), file, default=str)
+    for name in statements:
+        provider.statement(symbol, name).to_csv(os.path.join(folder, f'{name}.csv'))
+    return folder
+
+def provider_from_environment():
+    """
+    Provider selected by the environment.
+
+    NOVA_REPLAY=archive.zip replays a recorded session (NOVA_REPLAY_LATENCY:
+    seconds or 'recorded'). Otherwise the fixture backend when NOVA_FIXTURES
+    points to a directory, Yahoo Finance if not; NOVA_RECORD=archive.zip
+    records everything that backend returns.
+    """
+    replay = os.getenv('NOVA_REPLAY')
+    if replay:
+        return ReplayProvider(replay, parse_latency(os.getenv('NOVA_REPLAY_LATENCY')))
+    directory = os.getenv('NOVA_FIXTURES')
+    provider = FixtureProvider(directory) if directory else YFinanceProvider()
+    record = os.getenv('NOVA_RECORD')
+    if record:
+        return RecordingProvider(provider, record)
+    return provider
@@ -0,0 +1,127 @@
+import threading
+from PySide6.QtCore import Signal
+from PySide6.QtGui import QResizeEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+
+class ThreadedCanvas(FigureCanvasQTAgg):
+    """
+    Qt canvas that can lay out and rasterize its figure on a worker thread.
+
+    ``render`` hands the expensive part of a full redraw (tight_layout and the
+    Agg rasterization) to a TaskRunner. While the worker owns the figure,
+    draws and resizes requested on the GUI thread are deferred and replayed
+    when it finishes, so the figure is never touched by two threads at once.
+    The canvas draws into its own Agg renderer, so showing the result is just
+    a repaint: paintEvent wraps that buffer in a QImage without copying it.
+
+    ``render_started`` and ``render_finished`` let the window show a
+    placeholder in place of the canvas while a render is in flight.
+
+    ``draw_event`` listeners (e.g. ChartInteraction.on_draw, which caches the
+    blit background) always run on the GUI thread: the events fired by a
+    worker draw are held and delivered when the render finishes. Code that
+    reads the figure from the GUI thread outside the draw path (savefig, for
+    instance) must call ``wait_for_render`` first.
+    """
+
+    render_started = Signal()
+    render_finished = Signal()
+
+    def __init__(self, figure=None):
+        super().__init__(figure)
+        self.rendering = False
+        self._deferred_draw = False
+        self._deferred_size = None
+        self._idle = threading.Event()
+        self._idle.set()
+        self._worker = threading.local()  # marca a thread que está desenhando
+        self._worker_draw_events = []  # (ouvinte, evento) disparados no worker
+
+    def render(self, runner, prepare=None):
+        """
+        Rasterize the figure on ``runner``'s thread pool.
+
+        Parameters
+        ----------
+        runner : workers.TaskRunner
+            Runner whose pool does the work; the result comes back on the GUI thread
+        prepare : callable, optional
+            Run on the worker right before drawing (e.g. layout, level-of-detail refresh)
+        """
+        if self.rendering:
+            self._deferred_draw = True
+            return
+        self.rendering = True
+        self._idle.clear()
+        self._deferred_draw = False
+        self._deferred_size = None
+        self.render_started.emit()
+        runner.submit('render', self._rasterize, prepare, on_result=self._on_rendered, on_error=self._on_render_error)
+
+    def wait_for_render(self, timeout=None):
+        """
+        Block until the worker has released the figure; True if it has.
+        """
+        return self._idle.wait(timeout)
+
+    def mpl_connect(self, s, func):
+        if s == 'draw_event':
+            listener = func
+
+            def func(event):
+                if getattr(self._worker, 'active', False):
+                    # Ouvintes mexem em widgets e na figura: são chamados na thread da interface, ao final
+                    self._worker_draw_events.append((listener, event))
+                else:
+                    listener(event)
+        return super().mpl_connect(s, func)
+
+    def _rasterize(self, prepare):
+        # Roda fora da thread da interface: só a figura e o renderizador Agg, nenhum widget
+        self._worker.active = True
+        try:
+            if prepare is not None:
+                prepare()
+            FigureCanvasAgg.draw(self)
+        finally:
+            self._worker.active = False
+            self._idle.set()
+
+    def _deliver_draw_events(self):
+        events, self._worker_draw_events = self._worker_draw_events, []
+        for listener, event in events:
+            listener(event)
+
+    def _on_rendered(self, result):
+        self.rendering = False
+        # Antes de render_finished, que pode começar outra renderização
+        self._deliver_draw_events()
+        self.render_finished.emit()
+        if self._deferred_size is not None:
+            # A janela mudou de tamanho durante a renderização; aplica agora o tamanho atual
+            old_size, self._deferred_size = self._deferred_size, None
+            super().resizeEvent(QResizeEvent(self.size(), old_size))
+        elif self._deferred_draw:
+            self.draw_idle()
+        self.update()
+
+    def _on_render_error(self, message):
+        print(f"Erro ao renderizar o gráfico: {message}")
+        self._worker_draw_events = []
+        self.rendering = False
+        self.render_finished.emit()
+        self.draw_idle()
+
+    def draw(self):
+        if self.rendering:
+            self._deferred_draw = True
+            return
+        super().draw()
+
+    def resizeEvent(self, event):
+        if self.rendering:
+            if self._deferred_size is None:
+                self._deferred_size = event.oldSize()
+            return
+        super().resizeEvent(event)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+CALENDAR_PERIODS = {
+    'W': 'semanal',
+    'M': 'mensal',
+}
+
+def aggregate(data, period):
+    """
+    Build candles of ``period`` from daily OHLCV bars.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Daily bars with Open, High, Low, Close and Volume columns
+    period : int or str
+        Number of trading days per candle, or 'W'/'M' for calendar-aligned
+        weekly/monthly candles
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per candle, indexed by the date of its first bar
+    """
+    if isinstance(period, str):
+        return aggregate_calendar(data, period)
+    return aggregate_fixed(data, period)
+
+def aggregate_fixed(data, period):
+    """
+    Group every ``period`` consecutive bars into one candle.
+    """
+    if period <= 1 or data.empty:
+        return data
+    starts = np.arange(0, len(data), period)
+    return _reduce_at(data, starts)
+
+def aggregate_calendar(data, rule):
+    """
+    Group bars by calendar week ('W', starting on Monday) or month ('M').
+    """
+    if rule not in CALENDAR_PERIODS:
+        raise ValueError(f"Período de calendário inválido: {rule}")
+    if data.empty:
+        return data
+
+    index = data.index
+    if getattr(index, 'tz', None) is not None:
+        # Agrupa pela data local da bolsa, não por UTC
+        index = index.tz_localize(None)
+
+    if rule == 'W':
+        # Dias desde 1970-01-01 independentes da resolução do índice (ns no pandas 2, us no pandas 3)
+        days = index.to_numpy().astype('datetime64[D]').astype(np.int64)
+        keys = (days + 3) // 7  # 1970-01-01 foi uma quinta-feira
+    else:
+        keys = index.year.to_numpy() * 12 + index.month.to_numpy()
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return _reduce_at(data, starts)
+
+def reduce_ohlcv(open_, high, low, close, volume, starts):
+    """
+    OHLC-correct aggregation (first/max/min/last/sum) of NumPy arrays into
+    the groups beginning at ``starts``.
+    """
+    # Uma única passada por coluna: cada grupo vai de starts[i] até starts[i + 1] - 1
+    ends = np.r_[starts[1:], len(open_)] - 1
+    return (
+        open_[starts],
+        np.maximum.reduceat(high, starts),
+        np.minimum.reduceat(low, starts),
+        close[ends],
+        np.add.reduceat(volume, starts),
+    )
+
+def _reduce_at(data, starts):
+    open_, high, low, close, volume = reduce_ohlcv(
+        data['Open'].to_numpy(), data['High'].to_numpy(), data['Low'].to_numpy(),
+        data['Close'].to_numpy(), data['Volume'].to_numpy(), starts
+    )
+    return pd.DataFrame({
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': volume,
+    }, index=pd.Index(data.index[starts], name='Date'))
@@ -2,10 +2,10 @@
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QPushButton, QComboBox
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-import yfinance as yf
 import pandas as pd
-from .stockdata import convert_to_brl_naturallanguage
+from .stockdata import convert_to_brl_naturallanguage, get_statement
 from .assets import styles
+from .workers import TaskRunner
 import matplotlib.gridspec as gridspec
 
 class RevenueIncomeChart(QMainWindow):
@@ -14,6 +14,7 @@ class RevenueIncomeChart(QMainWindow):
         self.setStyleSheet(styles.light_mode)
         self.ticker = ticker
         self.period = "Trimestral"  # Default to quarterly view
+        self.task_runner = TaskRunner(self)
         self.setup_ui()
         if ticker:
             self.load_data()
@@ -42,15 +43,19 @@ class RevenueIncomeChart(QMainWindow):
         if not self.ticker:
             return
 
-        ticker = self.ticker + ".SA" if not self.ticker.endswith(".SA") else self.ticker
-        stock = yf.Ticker(ticker)
-
+        # Os demonstrativos ficam em cache, trocar o período não baixa nada de novo
+        statement = 'quarterly_financials' if self.period == "Trimestral" else 'financials'
+        self.task_runner.submit(
+            'statements',
+            get_statement,
+            self.ticker,
+            statement,
+            on_result=self.show_financials,
+            on_error=lambda message: print(f"Error loading financial  {message}")
+        )
+
+    def show_financials(self, financials):
         try:
-            if self.period == "Trimestral":
-                financials = stock.quarterly_financials
-            else:
-                financials = stock.financials
-
             # Extract revenue and net income
             self.revenue = financials.loc['Total Revenue']
             self.net_income = financials.loc['Net Income']
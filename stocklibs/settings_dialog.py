@@ -21,7 +21,13 @@ class SettingsManager:
             "stochastic_d_period": 3,
             "start_date": QDate.currentDate().addYears(-1),
             "end_date": QDate.currentDate(),
-            "candlestick_period": 1
+            "candlestick_period": 1,
+            "info_cache_ttl": 300,  # Segundos que o snapshot do .info é reaproveitado
+            "candle_cache_max_mb": 256,  # Memória máxima usada pelo cache de candlesticks
+            "chart_lod": True,  # Agrega candles para no máximo um por pixel na janela visível
+            "threaded_render": True,  # Faz layout e rasterização do gráfico fora da thread da interface
+            "trading_day_axis": False,  # Posiciona os candles por índice de pregão, sem buracos de fins de semana e feriados
+            "ticker_index_days": 7  # Dias até atualizar a lista local de tickers da B3
         }
 
         # Initialize settings with defaults
@@ -272,6 +278,30 @@ class SettingsDialog(QDialog):
         self.candlestick_period.setRange(1, 365)  # Set appropriate range
         tab.addRow(QLabel("Período de Candlestick padrão (dias):"), self.candlestick_period)
 
+        self.info_cache_ttl = QSpinBox()
+        self.info_cache_ttl.setRange(0, 24 * 60 * 60)
+        self.info_cache_ttl.setSuffix(" s")
+        tab.addRow(QLabel("Validade das informações do ticker:"), self.info_cache_ttl)
+
+        self.candle_cache_max_mb = QSpinBox()
+        self.candle_cache_max_mb.setRange(16, 8192)
+        self.candle_cache_max_mb.setSuffix(" MB")
+        tab.addRow(QLabel("Memória máxima do cache de candlesticks:"), self.candle_cache_max_mb)
+
+        self.ticker_index_days = QSpinBox()
+        self.ticker_index_days.setRange(1, 365)
+        self.ticker_index_days.setSuffix(" dias")
+        tab.addRow(QLabel("Atualizar a lista de tickers da B3 a cada:"), self.ticker_index_days)
+
+        self.chart_lod = QCheckBox("Agregar candles para no máximo um por pixel")
+        tab.addRow(self.chart_lod)
+
+        self.threaded_render = QCheckBox("Desenhar o gráfico fora da thread da interface")
+        tab.addRow(self.threaded_render)
+
+        self.trading_day_axis = QCheckBox("Eixo por pregão, sem fins de semana e feriados")
+        tab.addRow(self.trading_day_axis)
+
         # Create a widget to hold the layout
         data_widget = QWidget()
         data_widget.setLayout(tab)
@@ -291,6 +321,12 @@ class SettingsDialog(QDialog):
         self.start_date.setDate(self.settings_manager.start_date)
         self.end_date.setDate(self.settings_manager.end_date)
         self.candlestick_period.setValue(self.settings_manager.candlestick_period)
+        self.info_cache_ttl.setValue(self.settings_manager.get('info_cache_ttl', 300))
+        self.candle_cache_max_mb.setValue(self.settings_manager.get('candle_cache_max_mb', 256))
+        self.ticker_index_days.setValue(self.settings_manager.get('ticker_index_days', 7))
+        self.chart_lod.setChecked(self.settings_manager.get('chart_lod', True))
+        self.threaded_render.setChecked(self.settings_manager.get('threaded_render', True))
+        self.trading_day_axis.setChecked(self.settings_manager.get('trading_day_axis', False))
 
     def save_settings(self):
         # Save settings to SettingsManager
@@ -306,6 +342,12 @@ class SettingsDialog(QDialog):
         self.settings_manager.start_date = self.start_date.date()
         self.settings_manager.end_date = self.end_date.date()
         self.settings_manager.candlestick_period = self.candlestick_period.value()
+        self.settings_manager.set('info_cache_ttl', self.info_cache_ttl.value())
+        self.settings_manager.set('candle_cache_max_mb', self.candle_cache_max_mb.value())
+        self.settings_manager.set('ticker_index_days', self.ticker_index_days.value())
+        self.settings_manager.set('chart_lod', self.chart_lod.isChecked())
+        self.settings_manager.set('threaded_render', self.threaded_render.isChecked())
+        self.settings_manager.set('trading_day_axis', self.trading_day_axis.isChecked())
 
     def reset_to_defaults(self):
         # Reset settings to default values
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+from datetime import datetime
+from PySide6.QtCore import QObject, QEvent
+from PySide6.QtWidgets import QApplication
+
+def process_start():
+    """
+    ``time.perf_counter()`` value at which this process started, read from
+    /proc on Linux; None where the start time is not available.
+    """
+    try:
+        with open('/proc/self/stat') as file:
+            # Campos depois do nome do executável, que pode ter espaços; starttime é o 22º campo
+            start_ticks = int(file.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as file:
+            uptime = float(file.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return time.perf_counter() - (uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+
+class FirstPaintTimer(QObject):
+    """
+    Measures the time from process start to the first paint of a widget.
+
+    Where the process start time is not available (outside Linux), the
+    measurement starts at ``imported``, the moment main.py was imported.
+    Only with NOVA_DEBUG=1 or NOVA_STARTUP_EXIT=1 is the measurement printed
+    and appended to ``startup.log`` next to the settings (timestamp,
+    milliseconds and reference); with the latter the application also quits
+    right after the first paint, which is how benchmarks/bench_startup.py
+    times it.
+    """
+
+    def __init__(self, widget, imported, log_path=None):
+        super().__init__(widget)
+        started = process_start()
+        if started is None:
+            self.started, self.reference = imported, 'desde a importação do main.py'
+        else:
+            self.started, self.reference = started, 'desde o início do processo'
+        self.log_path = log_path or self._get_log_path()
+        self.elapsed = None
+        widget.installEventFilter(self)
+
+    def _get_log_path(self):
+        # Same base directory as SettingsManager
+        if sys.platform == "win32":
+            return os.path.join(os.getenv('APPDATA'), 'stockanalysis', 'startup.log')
+        else:
+            return os.path.join(os.path.expanduser('~'), '.config', 'stockanalysis', 'startup.log')
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.started
+            watched.removeEventFilter(self)
+            self.record()
+            if os.getenv('NOVA_STARTUP_EXIT') == '1':
+                QApplication.instance().quit()
+        return False
+
+    def record(self):
+        if os.getenv('NOVA_DEBUG') != '1' and os.getenv('NOVA_STARTUP_EXIT') != '1':
+            return
+        milliseconds = self.elapsed * 1000
+        print(f"Tempo até a primeira pintura: {milliseconds:.0f} ms ({self.reference})")
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, 'a') as file:
+                file.write(f"{datetime.now().isoformat(timespec='seconds')}\t{milliseconds:.1f}\t{self.reference}\n")
+        except OSError as e:
+            print(f"Erro ao salvar o tempo de inicialização: {e}")
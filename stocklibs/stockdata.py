@@ -1,11 +1,36 @@
-import yfinance as yf
-import matplotlib.pyplot as plt
-import mplfinance as mpf
 import pandas as pd
-from PySide6.QtWidgets import QMessageBox
-import docx
+import time
+import random
 import datetime
+import threading
+import contextlib
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from .history_store import HistoryStore
+from .cache import InfoCache, StatementsCache, SingleFlight
+from .providers import provider_from_environment
+from .tickers import ticker_index
+
+# Fonte dos dados de mercado (Yahoo Finance ou fixtures locais); escolhida no primeiro uso
+_provider = None
+
+# Store local dos candles diários, evita baixar novamente o que já foi baixado
+history_store = HistoryStore()
+
+# Snapshot do .info compartilhado por todas as funções fetch_*
+info_cache = InfoCache(ttl=300)
+
+# Demonstrativos (trimestrais e anuais) compartilhados por gráficos, métricas e indicadores
+statements_cache = StatementsCache()
+
+# Pedidos de histórico iguais feitos ao mesmo tempo (ex.: gráfico e relatório) viram um só;
+# quem espera recebe uma cópia, porque alguns chamadores renomeiam as colunas
+history_flights = SingleFlight(copy=lambda data: data.copy())
+
+# Máximo de requisições simultâneas ao mesmo servidor (o Yahoo limita quem abre conexões demais)
+HOST_CONCURRENCY = 8
+_host_slots = {}
+_host_slots_lock = threading.Lock()
 
 HUMAN_READABLE_PERIODS = {
     "1d": "1 dia", 
@@ -19,32 +44,125 @@ HUMAN_READABLE_PERIODS = {
     "max": "máximo"
 }
 
+def get_provider():
+    """
+    Return the market-data provider used by every fetch in this module.
+    """
+    global _provider
+    if _provider is None:
+        _provider = provider_from_environment()
+    return _provider
+
+def set_provider(provider):
+    """
+    Switch the market-data provider (e.g. to a FixtureProvider for offline runs).
+
+    The in-memory info and statement caches are dropped so nothing from the
+    previous provider is served afterwards.
+    """
+    global _provider
+    _provider = provider
+    info_cache.invalidate()
+    statements_cache.invalidate()
+
+def _host_slot(provider):
+    # Semáforo compartilhado por todas as threads que consultam o mesmo servidor
+    if provider.host is None:
+        return contextlib.nullcontext()
+    with _host_slots_lock:
+        if provider.host not in _host_slots:
+            _host_slots[provider.host] = threading.BoundedSemaphore(HOST_CONCURRENCY)
+        return _host_slots[provider.host]
+
+def _normalize_symbol(symbol: str):
+    symbol = symbol.upper()
+    if not symbol.endswith('.SA'):
+        symbol += '.SA'
+    return symbol
+
+def get_info(symbol: str):
+    """
+    Return the (cached) info dictionary of a ticker
+    """
+    def load(s):
+        provider = get_provider()
+        with _host_slot(provider):
+            return provider.info(s)
+    return info_cache.get(_normalize_symbol(symbol), load)
+
+def invalidate_info(symbol: str = None):
+    info_cache.invalidate(_normalize_symbol(symbol) if symbol else None)
+
+def _load_statements(symbol: str):
+    provider = get_provider()
+    with _host_slot(provider):
+        return {name: provider.statement(symbol, name) for name in StatementsCache.STATEMENTS}
+
+def get_statement(symbol: str, name: str):
+    """
+    Return one of the (cached) financial statements of a ticker
+
+    Parameters
+    ----------
+    symbol : str
+        Stock symbol
+    name : str
+        One of StatementsCache.STATEMENTS, e.g. 'quarterly_balance_sheet'
+    """
+    return statements_cache.get(_normalize_symbol(symbol), _load_statements)[name]
+
+def invalidate_statements(symbol: str = None):
+    statements_cache.invalidate(_normalize_symbol(symbol) if symbol else None)
+
 def is_valid_ticker(symbol: str):
     if not symbol or not symbol.isalnum():
         return False
     if len(symbol) > 5 and not symbol.endswith('11'):
         return False
+    # O índice local responde sem rede; a consulta ao .info fica só para tickers desconhecidos
+    if symbol in ticker_index:
+        return True
     try:
         symbol: str = symbol.upper()
         if not symbol.endswith('.SA'):
             symbol += '.SA'
-        ticker = yf.Ticker(symbol)
-        return ticker.info.get('symbol') == symbol
+        info = get_info(symbol)
+        if info.get('symbol') != symbol:
+            return False
+        ticker_index.add(symbol, info.get('longName') or info.get('shortName'), info.get('sector'))
+        return True
     except Exception as e:
         # print(f"Error validating ticker: {e}")
         return False
 
+def _download_history(symbol, start_date, end_date):
+    provider = get_provider()
+    with _host_slot(provider):
+        data = provider.history(symbol, start=start_date, end=end_date)
+    if data.empty:
+        raise ValueError("No data available for this stock symbol")
+    return data
+
+def _history(symbol, period, start_date, end_date):
+    key = (symbol, period, str(start_date), str(end_date))
+    return history_flights.do(key, lambda: _load_history(symbol, period, start_date, end_date))
+
+def _load_history(symbol, period, start_date, end_date):
+    if not (start_date and end_date):
+        provider = get_provider()
+        with _host_slot(provider):
+            return provider.history(symbol, period=period)
+    if not get_provider().cacheable:
+        return _download_history(symbol, start_date, end_date)
+    return history_store.get(symbol, start_date, end_date, lambda start, end: _download_history(symbol, start, end))
+
 def _fetch(symbol, period=None, start_date=None, end_date=None, show_volume=True):
     symbol = symbol.upper()
     if not symbol.endswith('.SA'):
         symbol += '.SA'
 
     try:
-        stock = yf.Ticker(symbol)
-        if start_date and end_date:
-            data = stock.history(start=start_date, end=end_date)
-        else:
-            data = stock.history(period=period)
+        data = _history(symbol, period, start_date, end_date)
 
         if data.empty:
             raise ValueError("No data available for this stock symbol")
@@ -90,45 +208,51 @@ def validate_dates(start_date, end_date):
         raise e
 
 def fetch_data(symbol, period=None, start_date=None, end_date=None, show_ma_sma=False, show_ma_ema=False, show_volume=True, ma_period=20):
-    try:
-        data = _fetch(symbol, period=period, start_date=start_date, end_date=end_date, show_volume=show_volume)
-
-        # Configuração do estilo do gráfico
-        mc = mpf.make_marketcolors(up='g', down='r',
-                                 edge='inherit',
-                                 wick='inherit',
-                                 volume='in')
-        s = mpf.make_mpf_style(marketcolors=mc, gridstyle=':', y_on_right=False)
-
-        # Lista para armazenar os plots adicionais
-        addplots = []
-
-        # Adiciona média móvel se solicitado
-        if show_ma_sma:
-            # Calcula a média móvel simples
-            sma = data['Close'].rolling(window=ma_period).mean()
-            addplots.append(mpf.make_addplot(sma, color='blue', width=0.8, label='SMA'))
-
-        if show_ma_ema:
-            # Calcula a média móvel exponencial
-            ema = data['Close'].ewm(span=ma_period, adjust=False).mean()
-            addplots.append(mpf.make_addplot(ema, color='green', width=0.8, label='EMA'))
-
-        # Plotando o gráfico
-        fig, _ = mpf.plot(data, type='candle', 
-                        style=s,
-                        title=f'{symbol} Preço da Ação',
-                        volume=show_volume,
-                        addplot=addplots if addplots else [],  # Ensure it's an empty list if no plots
-                        returnfig=True)
-
-        # Show chart in a native MPL window
-        plt.show()
-
-    except ValueError as e:
-        QMessageBox.critical("Erro", str(e))
+    """
+    Show a candlestick chart of the symbol in a native Matplotlib window.
 
-def save_data_excel(symbol, start_date, end_date, file_name, parent):
+    Raises
+    ------
+    ValueError
+        If the data can't be fetched
+    """
+    import matplotlib.pyplot as plt
+    import mplfinance as mpf
+    data = _fetch(symbol, period=period, start_date=start_date, end_date=end_date, show_volume=show_volume)
+
+    # Configuração do estilo do gráfico
+    mc = mpf.make_marketcolors(up='g', down='r',
+                             edge='inherit',
+                             wick='inherit',
+                             volume='in')
+    s = mpf.make_mpf_style(marketcolors=mc, gridstyle=':', y_on_right=False)
+
+    # Lista para armazenar os plots adicionais
+    addplots = []
+
+    # Adiciona média móvel se solicitado
+    if show_ma_sma:
+        # Calcula a média móvel simples
+        sma = data['Close'].rolling(window=ma_period).mean()
+        addplots.append(mpf.make_addplot(sma, color='blue', width=0.8, label='SMA'))
+
+    if show_ma_ema:
+        # Calcula a média móvel exponencial
+        ema = data['Close'].ewm(span=ma_period, adjust=False).mean()
+        addplots.append(mpf.make_addplot(ema, color='green', width=0.8, label='EMA'))
+
+    # Plotando o gráfico
+    fig, _ = mpf.plot(data, type='candle', 
+                    style=s,
+                    title=f'{symbol} Preço da Ação',
+                    volume=show_volume,
+                    addplot=addplots if addplots else [],  # Ensure it's an empty list if no plots
+                    returnfig=True)
+
+    # Show chart in a native MPL window
+    plt.show()
+
+def save_data_excel(symbol, start_date, end_date, file_name):
     """
     Save the stock data as an Excel spreadsheet
 
@@ -136,27 +260,31 @@ def save_data_excel(symbol, start_date, end_date, file_name, parent):
     ----------
     symbol : str
         Stock symbol
-    period : str
-        Data period
+    start_date, end_date : str
+        Data range in YYYY-MM-DD format
     file_name : str
         File name to be saved
-    """
-    try:
-        data = _fetch(symbol, start_date=start_date, end_date=end_date, show_volume=True)
 
-        # Translate column titles
-        data.columns = ['Abertura', 'Alta', 'Baixa', 'Fechamento', 'Volume', 'Dividendos', 'Splits']
+    Returns
+    -------
+    str
+        The file name, once saved
 
-        # Create ExcelWriter object
-        with pd.ExcelWriter(f'{file_name}') as writer:
-            # Write data to Excel file
-            data.to_excel(writer, index=False)
+    Raises
+    ------
+    ValueError
+        If the data can't be fetched
+    """
+    data = _fetch(symbol, start_date=start_date, end_date=end_date, show_volume=True)
 
-            # Show a success message
-            QMessageBox.information(parent, "Sucesso", f"Os dados foram salvos com sucesso em {file_name}")
-            
-    except ValueError as e:
-        QMessageBox.critical(parent, "Erro", str(e))
+    # Translate column titles
+    data.columns = ['Abertura', 'Alta', 'Baixa', 'Fechamento', 'Volume', 'Dividendos', 'Splits']
+
+    # Create ExcelWriter object
+    with pd.ExcelWriter(f'{file_name}') as writer:
+        # Write data to Excel file
+        data.to_excel(writer, index=False)
+    return file_name
 
 def generate_report(symbol, file_name):
     """
@@ -166,13 +294,20 @@ def generate_report(symbol, file_name):
     ----------
     symbol : str
         Stock symbol
-    start_date : str
-        Start date in DD/MM/YYYY format
-    end_date : str
-        End date in DD/MM/YYYY format
     file_name : str
         File name to be saved
+
+    Returns
+    -------
+    str
+        The file name, once saved
+
+    Raises
+    ------
+    ValueError
+        If the report can't be generated
     """
+    import docx
     try:
         start_date = (datetime.datetime.now() - datetime.timedelta(days=365)).strftime('%Y-%m-%d')
         end_date = datetime.datetime.now().strftime('%Y-%m-%d')
@@ -254,9 +389,7 @@ def generate_report(symbol, file_name):
 
         # Save the document
         doc.save(file_name)
-
-        # Show a success message
-        QMessageBox.information(None, "Sucesso", "O relatório foi gerado e salvo com sucesso.")
+        return file_name
 
     except Exception as e:
         raise ValueError(f"Erro gerando relatório: {str(e)}")
@@ -265,53 +398,45 @@ def fetch_pvp(symbol: str):
     """
     Calculate the price-to-Book ratio of a ticker
     """
-    ticker = symbol + ".SA" if not symbol.endswith(".SA") else symbol
-    data = yf.Ticker(ticker).info
+    data = get_info(symbol)
     try:
         pvp = data['priceToBook']
     except:
-        QMessageBox.warning(None, "Erro", f"Erro ao obter o P/VP para {symbol}.")
+        # Pode rodar fora da thread da interface, então apenas registra o erro
+        print(f"Erro ao obter o P/VP para {symbol}.")
         return "Erro ao obter o P/VP"
     
     return f"{pvp:.2f}"
     
 
 def fetch_pe(symbol: str):
-    ticker = symbol + ".SA" if not symbol.endswith(".SA") else symbol
-    data = yf.Ticker(ticker).info
+    data = get_info(symbol)
     value = data.get('trailingPE', 'Não disponível')
     if value != 'Não disponível':
         value = f"{value:.2f}"
     return value
 
 def fetch_roe(symbol: str):
-    ticker = symbol + ".SA" if not symbol.endswith(".SA") else symbol
-    data = yf.Ticker(ticker).info
+    data = get_info(symbol)
     value = data.get('returnOnEquity', 'Não disponível')
     if value != 'Não disponível':
         value = f"{value * 100:.2f}%"
     return value
 
 def fetch_dividend_yield(symbol: str):
-    ticker = symbol + ".SA" if not symbol.endswith(".SA") else symbol
-    data = yf.Ticker(ticker).info
+    data = get_info(symbol)
     value = data.get('dividendYield', 'Não disponível')
     if isinstance(value, (int, float)):
         value = f"{value * 100:.2f}%"
     return value
 
-import yfinance as yf
-
 def fetch_debt_to_ebitda(symbol: str):
-    # Carregar o objeto da empresa
-    empresa = yf.Ticker(symbol)
-    
     # Obter as demonstrações financeiras
-    financials = empresa.financials
+    financials = get_statement(symbol, 'financials')
     
     # Obter a Dívida Total (Short + Long Term Debt)
     # Isso pode ser obtido do balanço patrimonial
-    balance_sheet = empresa.balance_sheet
+    balance_sheet = get_statement(symbol, 'balance_sheet')
     divida_total = balance_sheet.loc['Total Debt'].iloc[0] if 'Total Debt' in balance_sheet.index else 0
     
     # Obter o Lucro Operacional (EBIT) - normalmente encontrado na Demonstração de Resultados
@@ -319,7 +444,7 @@ def fetch_debt_to_ebitda(symbol: str):
     
     # Obter Depreciação e Amortização
     # A depreciação e amortização pode ser obtida do fluxo de caixa (Cash Flow Statement)
-    cashflow = empresa.cashflow
+    cashflow = get_statement(symbol, 'cashflow')
     depreciacao = cashflow.loc['Depreciation'].iloc[0] if 'Depreciation' in cashflow.index else 0
     amortizacao = cashflow.loc['Amortization'].iloc[0] if 'Amortization' in cashflow.index else 0
     
@@ -332,8 +457,7 @@ def fetch_debt_to_ebitda(symbol: str):
     return divida_ebitda
 
 def fetch_net_margin(symbol: str):
-    ticker = symbol + ".SA" if not symbol.endswith(".SA") else symbol
-    data = yf.Ticker(ticker).info
+    data = get_info(symbol)
     value = data.get('profitMargins', 'Não disponível')
     if value != 'Não disponível':
         value = f"{value * 100:.2f}%"
@@ -359,11 +483,7 @@ def fetch(symbol, period=None, start_date=None, end_date=None):
         symbol += '.SA'
 
     try:
-        stock = yf.Ticker(symbol)
-        if start_date and end_date:
-            data = stock.history(start=start_date, end=end_date)
-        else:
-            data = stock.history(period=period)
+        data = _history(symbol, period, start_date, end_date)
 
         if data.empty:
             raise ValueError("No data available for this stock symbol")
@@ -372,6 +492,94 @@ def fetch(symbol, period=None, start_date=None, end_date=None):
     except Exception as e:
         raise ValueError(f"Error fetching data: {str(e)}")
 
+def fetch_range(symbol, start_date, end_date):
+    """
+    Bars of ``symbol`` in [start_date, end_date) straight from the provider.
+
+    Unlike fetch(), an empty frame is returned as is: it means the provider
+    has no bars in the range (e.g. before the ticker was listed), while a
+    provider error propagates. Bars found are merged into the history store.
+    """
+    symbol = _normalize_symbol(symbol)
+    provider = get_provider()
+    with _host_slot(provider):
+        data = provider.history(symbol, start=start_date, end=end_date)
+    if not data.empty and provider.cacheable:
+        history_store.get(symbol, start_date, end_date, lambda start, end: _stored_part(data, start, end))
+    return data
+
+def _stored_part(data, start, end):
+    from .history_store import slice_range
+    part = slice_range(data, start, end)
+    if part.empty:
+        raise ValueError("No data available for this stock symbol")
+    return part
+
+def _fetch_with_retry(symbol, start_date, end_date, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            data = _history(symbol, None, start_date, end_date)
+            if data.empty:
+                raise ValueError("No data available for this stock symbol")
+            return data
+        except Exception as e:
+            # O yfinance responde vazio (ValueError) tanto a um ticker sem dados quanto a limite de
+            # requisições ou falha de rede; só um ticker fora da lista da B3 desiste sem nova tentativa
+            if attempt == retries or (isinstance(e, ValueError) and _unknown_symbol(symbol)):
+                raise
+            # Espera exponencial com variação aleatória, para as threads não voltarem juntas
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+def _unknown_symbol(symbol):
+    return len(ticker_index) > 0 and symbol not in ticker_index
+
+def fetch_many(symbols, start_date, end_date, max_workers=16, retries=3, backoff=1.0):
+    """
+    Download the daily bars of many symbols in parallel into the history store.
+
+    Parameters
+    ----------
+    symbols : iterable of str
+        Tickers, with or without the .SA suffix (duplicates are fetched once)
+    start_date, end_date : str or date
+        Requested range, end exclusive
+    max_workers : int
+        Size of the worker pool; requests to the same host are further
+        limited to HOST_CONCURRENCY at a time
+    retries : int
+        Extra attempts after an error or an empty response (how yfinance
+        reports throttling), with exponential backoff starting at ``backoff``
+        seconds. Empty responses for symbols missing from the local ticker
+        index are not retried.
+
+    Returns
+    -------
+    tuple
+        (data, errors): ``{symbol: DataFrame}`` for the symbols that were
+        fetched and ``{symbol: message}`` for the ones that failed. One
+        failure never aborts the batch.
+    """
+    symbols = list(dict.fromkeys(_normalize_symbol(symbol) for symbol in symbols))
+    data, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {symbol: pool.submit(_fetch_with_retry, symbol, start_date, end_date, retries, backoff) for symbol in symbols}
+        for symbol, future in futures.items():
+            try:
+                data[symbol] = future.result()
+            except Exception as e:
+                errors[symbol] = str(e)
+    return data, errors
+
+def request_stats():
+    """
+    Calls issued and calls coalesced into one already in flight, per kind of request.
+    """
+    return {
+        'info': info_cache.flights.stats(),
+        'statements': statements_cache.flights.stats(),
+        'history': history_flights.stats(),
+    }
+
 def convert_to_brl_naturallanguage(value: float) -> str:
     # Convert to Brazilian natural language, like 52 bilhões instead of 52000000000
 
@@ -407,15 +615,14 @@ def convert_to_brl_naturallanguage(value: float) -> str:
     return _format_number(value)
 
 def fetch_stock_data(ticker):
-    ticker = yf.Ticker(ticker)
-    data = ticker.info
+    data = get_info(ticker)
 
     # Retrieve key financial data
     shares_outstanding = data.get('sharesOutstanding', 'Indeterminado')
 
     # Attempt to fetch balance sheet
     try:
-        balance_sheet = ticker.balance_sheet
+        balance_sheet = get_statement(ticker, 'balance_sheet')
         equity = balance_sheet.loc['Total Stockholder Equity'].iloc[0] if 'Total Stockholder Equity' in balance_sheet.index else 'Indeterminado'
         total_liabilities = balance_sheet.loc['Total Liab'].iloc[0] if 'Total Liab' in balance_sheet.index else 'Indeterminado'
         total_assets = balance_sheet.loc['Total Assets'].iloc[0] if 'Total Assets' in balance_sheet.index else 'Indeterminado'
@@ -443,10 +650,9 @@ def fetch_stock_data(ticker):
 
     # Calculate price ranges for yearly variation
     try:
-        stock = ticker
-        history = stock.history(period='1y')
+        history = _history(_normalize_symbol(ticker), '1y', None, None)
         yearly_low = history['Low'].min()
-        yearly_high = ticker.info['fiftyTwoWeekHigh']
+        yearly_high = data['fiftyTwoWeekHigh']
         year_variation = f"R$ {min(yearly_low, yearly_high):.2f} - R$ {max(yearly_low, yearly_high):.2f}"
     except KeyError:
         year_variation = 'Indeterminado'
@@ -500,8 +706,7 @@ def fetch_stock_data(ticker):
 
 
 def fetch_monthly_financials(symbol: str):
-    ticker = yf.Ticker(symbol)
-    data = ticker.financials
+    data = get_statement(symbol, 'financials')
 
     # Extract the relevant financial metrics
     try:
@@ -524,7 +729,7 @@ def fetch_monthly_financials(symbol: str):
     net_profit_margin = f"{net_profit_margin:.2f}%" if isinstance(net_profit_margin, float) else net_profit_margin
 
     try:
-        earnings_per_share = ticker.info.get('trailingEps', 'Não disponível')
+        earnings_per_share = get_info(symbol).get('trailingEps', 'Não disponível')
     except KeyError:
         earnings_per_share = 'Não disponível'
 
@@ -554,7 +759,7 @@ def fetch_monthly_financials(symbol: str):
         selling_general_and_administrative_expenses = 'Não disponível'
 
     try:
-        depreciation_expenses = ticker.cashflow.loc['Depreciation'].iloc[0]
+        depreciation_expenses = get_statement(symbol, 'cashflow').loc['Depreciation'].iloc[0]
     except KeyError:
         depreciation_expenses = 'Não disponível'
 
@@ -589,7 +794,7 @@ def fetch_quarterly_data(ticker, num_quarters=4):
     Fetch the specified number of quarterly total assets and total liabilities for the given ticker.
     """
     try:
-        data = yf.Ticker(ticker).financials
+        data = get_statement(ticker, 'financials')
         #print("Data fetched for quarterly:", data)  # Debug print
         total_assets = data.loc['Total Assets'].iloc[:, :num_quarters]  # Last num_quarters
         total_liabilities = data.loc['Total Liabilities Net'].iloc[:, :num_quarters]  # Last num_quarters
@@ -607,7 +812,7 @@ def fetch_annual_data(ticker, num_years=3):
     Fetch the specified number of annual total assets and total liabilities for the given ticker.
     """
     try:
-        data = yf.Ticker(ticker).financials
+        data = get_statement(ticker, 'financials')
         #print("Data fetched for annual:", data)  # Debug print
         total_assets = data.loc['Total Assets'].iloc[:, :num_years]  # Last num_years
         total_liabilities = data.loc['Total Liabilities Net'].iloc[:, :num_years]  # Last num_years
@@ -745,10 +950,8 @@ def decidir_potencial_de_crescimento(ticker):
     if not ticker.endswith('.SA'):
         ticker += '.SA'
     
-    empresa = yf.Ticker(ticker)
-    
     # Pegar os dados financeiros principais
-    info = empresa.info
+    info = get_info(ticker)
     
     # Indicadores de Crescimento
     eps_growth = info.get('earningsQuarterlyGrowth', None)  # Crescimento do EPS
@@ -0,0 +1,33 @@
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+from PySide6.QtWidgets import QCompleter
+
+class TickerCompleter(QCompleter):
+    """
+    Autocomplete for a ticker line edit, fed by a TickerIndex as the user types.
+
+    The popup shows the symbol with the company name and type; choosing an
+    entry puts only the symbol in the line edit.
+    """
+
+    def __init__(self, index, line_edit, limit=12):
+        super().__init__(line_edit)
+        self.index = index
+        self.limit = limit
+        self.items = QStandardItemModel(self)
+        self.setModel(self.items)
+        # A busca já foi feita pelo índice; o QCompleter só mostra o resultado
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCompletionRole(Qt.UserRole)
+        line_edit.setCompleter(self)
+        line_edit.textEdited.connect(self.update_matches)
+
+    def update_matches(self, text):
+        self.items.clear()
+        for ticker in self.index.search(text, self.limit):
+            description = " - ".join(part for part in (ticker.name, ticker.kind) if part)
+            item = QStandardItem(f"{ticker.symbol}  {description}" if description else ticker.symbol)
+            item.setData(ticker.symbol, Qt.UserRole)
+            self.items.appendRow(item)
+        if self.items.rowCount():
+            self.complete()
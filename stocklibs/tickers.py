@@ -0,0 +1,240 @@
+import os
+import sys
+import csv
+import io
+import json
+import time
+import bisect
+import datetime
+import threading
+import urllib.request
+from collections import namedtuple
+
+Ticker = namedtuple('Ticker', ['symbol', 'name', 'sector', 'kind'])
+
+# Tipo do papel pelo número no fim do código de negociação
+TYPE_BY_SUFFIX = {
+    '3': 'ON',
+    '4': 'PN',
+    '5': 'PNA',
+    '6': 'PNB',
+    '7': 'PNC',
+    '8': 'PND',
+    '11': 'Unit',
+    '31': 'BDR', '32': 'BDR', '33': 'BDR', '34': 'BDR', '35': 'BDR', '39': 'BDR',
+}
+
+# Categoria do arquivo da B3 (SctyCtgyNm) -> tipo; ações usam o sufixo
+TYPE_BY_CATEGORY = {
+    'UNIT': 'Unit',
+    'FUNDS': 'Fundo',
+    'BDR': 'BDR',
+    'ETF EQUITIES': 'ETF',
+}
+
+# Arquivo público "Cadastro de Instrumentos (Listado)" da B3, pedido por data com um token
+B3_FILES_URL = 'https://arquivos.b3.com.br/api/download'
+
+def ticker_type(symbol):
+    """
+    Type of a B3 symbol from its numeric suffix, e.g. 'PN' for PETR4 and 'Unit' for TAEE11.
+    """
+    digits = symbol[4:]
+    return TYPE_BY_SUFFIX.get(digits, '')
+
+def _base_symbol(symbol):
+    symbol = symbol.strip().upper()
+    return symbol[:-3] if symbol.endswith('.SA') else symbol
+
+def download_b3_instruments(days_back=7):
+    """
+    Download the cash-equity instruments listed on B3 as a list of Ticker.
+
+    The file is only published on trading days, so the most recent one in the
+    last ``days_back`` days is used. It has no sector; sectors come from the
+    provider's info when a symbol is validated over the network.
+    """
+    last_error = None
+    for days in range(days_back):
+        day = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+        try:
+            with urllib.request.urlopen(f"{B3_FILES_URL}/requestname?fileName=InstrumentsConsolidatedFile&date={day}", timeout=30) as response:
+                token = json.load(response)['token']
+            with urllib.request.urlopen(f"{B3_FILES_URL}/?token={token}", timeout=60) as response:
+                return parse_b3_instruments(response.read().decode('latin-1'))
+        except Exception as e:
+            last_error = e
+    raise ValueError(f"Não foi possível baixar a lista de instrumentos da B3: {last_error}")
+
+def parse_b3_instruments(text):
+    lines = text.splitlines()
+    # Algumas versões do arquivo trazem uma linha de título antes do cabeçalho
+    start = next((i for i, line in enumerate(lines) if 'TckrSymb' in line), 0)
+    tickers = []
+    for row in csv.DictReader(io.StringIO("\n".join(lines[start:])), delimiter=';'):
+        if row.get('SgmtNm', 'CASH') != 'CASH' or row.get('MktNm', 'EQUITY-CASH') != 'EQUITY-CASH':
+            continue
+        symbol = (row.get('TckrSymb') or '').strip()
+        # Códigos terminados em F são do mercado fracionário, mesmo papel do lote padrão
+        if not symbol or symbol.endswith('F'):
+            continue
+        category = (row.get('SctyCtgyNm') or '').strip()
+        tickers.append(Ticker(symbol, (row.get('CrpnNm') or '').strip(), '', TYPE_BY_CATEGORY.get(category) or ticker_type(symbol)))
+    return tickers
+
+class TickerIndex:
+    """
+    Local index of the symbols traded on B3 (ticker, name, sector, type).
+
+    Symbols are kept in a sorted list, so validation is a dictionary lookup
+    and prefix search for the autocomplete is a binary search; company names
+    are searchable by word prefix the same way. The index is saved as JSON
+    next to the settings, loaded on first use and refreshed from B3 when
+    older than the configured age. Symbols validated over the network are
+    added as they are found.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or self._get_index_path()
+        self.updated = 0
+        self.refreshing = False
+        self._entries = {}  # symbol -> Ticker
+        self._symbols = []  # ordenados, para busca por prefixo
+        self._words = []  # (palavra do nome, symbol), ordenados
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _get_index_path(self):
+        # Same base directory as SettingsManager
+        if sys.platform == "win32":
+            return os.path.join(os.getenv('APPDATA'), 'stockanalysis', 'tickers.json')
+        else:
+            return os.path.join(os.path.expanduser('~'), '.config', 'stockanalysis', 'tickers.json')
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path) as file:
+                        stored = json.load(file)
+                    self.updated = stored.get('updated', 0)
+                    self._rebuild(Ticker(*row) for row in stored.get('tickers', []))
+            except Exception as e:
+                print(f"Error loading ticker index: {e}")
+            self._loaded = True
+
+    def _rebuild(self, tickers):
+        self._entries = {ticker.symbol: ticker for ticker in tickers}
+        self._symbols = sorted(self._entries)
+        self._words = sorted((word, ticker.symbol) for ticker in self._entries.values() for word in ticker.name.lower().split())
+
+    def save(self):
+        with self._lock:
+            stored = {'updated': self.updated, 'tickers': [list(self._entries[symbol]) for symbol in self._symbols]}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump(stored, file, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving ticker index: {e}")
+
+    def __contains__(self, symbol):
+        self._ensure_loaded()
+        return _base_symbol(symbol) in self._entries
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._entries)
+
+    def get(self, symbol):
+        self._ensure_loaded()
+        return self._entries.get(_base_symbol(symbol))
+
+    def search(self, text, limit=10):
+        """
+        Tickers whose symbol starts with ``text``, then those with a word of the name starting with it.
+        """
+        self._ensure_loaded()
+        text = text.strip()
+        if not text:
+            return []
+        with self._lock:
+            prefix = _base_symbol(text)
+            found = []
+            i = bisect.bisect_left(self._symbols, prefix)
+            while i < len(self._symbols) and len(found) < limit and self._symbols[i].startswith(prefix):
+                found.append(self._symbols[i])
+                i += 1
+            word = text.lower()
+            i = bisect.bisect_left(self._words, (word, ''))
+            while i < len(self._words) and len(found) < limit and self._words[i][0].startswith(word):
+                if self._words[i][1] not in found:
+                    found.append(self._words[i][1])
+                i += 1
+            return [self._entries[symbol] for symbol in found]
+
+    def add(self, symbol, name='', sector='', kind=None):
+        """
+        Add (or update) one symbol and save the index.
+        """
+        self._ensure_loaded()
+        symbol = _base_symbol(symbol)
+        ticker = Ticker(symbol, name or '', sector or '', kind or ticker_type(symbol))
+        with self._lock:
+            if symbol not in self._entries:
+                bisect.insort(self._symbols, symbol)
+            else:
+                old = self._entries[symbol]
+                self._words = [entry for entry in self._words if entry[1] != symbol]
+                ticker = Ticker(symbol, ticker.name or old.name, ticker.sector or old.sector, ticker.kind or old.kind)
+            self._entries[symbol] = ticker
+            for word in ticker.name.lower().split():
+                bisect.insort(self._words, (word, symbol))
+        self.save()
+
+    def is_stale(self, max_age):
+        self._ensure_loaded()
+        return time.time() - self.updated > max_age
+
+    def refresh(self, loader=download_b3_instruments):
+        """
+        Replace the index with the symbols returned by ``loader``, keeping known sectors.
+        """
+        self._ensure_loaded()
+        self.refreshing = True
+        try:
+            tickers = loader()
+            with self._lock:
+                sectors = {symbol: ticker.sector for symbol, ticker in self._entries.items() if ticker.sector}
+                self._rebuild(ticker._replace(sector=ticker.sector or sectors.get(ticker.symbol, '')) for ticker in tickers)
+                self.updated = time.time()
+            self.save()
+            return len(tickers)
+        finally:
+            self.refreshing = False
+
+    def import_csv(self, path):
+        """
+        Load symbols from a CSV with ticker, name and (optional) sector and type columns.
+        """
+        def load():
+            with open(path, newline='', encoding='utf-8') as file:
+                rows = [row for row in csv.reader(file) if row and not row[0].startswith('#')]
+            if rows and rows[0][0].strip().lower() in ('ticker', 'symbol', 'codigo', 'código'):
+                rows = rows[1:]
+            tickers = []
+            for row in rows:
+                symbol = _base_symbol(row[0])
+                name, sector, kind = (cell.strip() for cell in (row[1:4] + [''] * 3)[:3])
+                tickers.append(Ticker(symbol, name, sector, kind or ticker_type(symbol)))
+            return tickers
+        return self.refresh(load)
+
+# Índice compartilhado pela validação (stockdata.is_valid_ticker) e pelo autocompletar
+ticker_index = TickerIndex()
@@ -0,0 +1,79 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+import itertools
+
+class WorkerSignals(QObject):
+    # (channel, generation, result)
+    finished = Signal(str, int, object)
+    # (channel, generation, message)
+    error = Signal(str, int, str)
+
+class Worker(QRunnable):
+    def __init__(self, channel, generation, fn, args, kwargs):
+        super().__init__()
+        self.channel = channel
+        self.generation = generation
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(self.channel, self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.channel, self.generation, result)
+
+class TaskRunner(QObject):
+    """
+    Runs blocking fetches and computations on a QThreadPool.
+
+    Every task is submitted on a channel (e.g. 'chart', 'indicators') and gets
+    a generation token. Submitting again on the same channel supersedes the
+    previous task: its result is dropped instead of being delivered. Callbacks
+    always run on the thread that owns the runner (the GUI thread).
+    """
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._counter = itertools.count(1)
+        self._current = {}  # channel -> generation
+        self._callbacks = {}  # generation -> (on_result, on_error)
+        self._workers = {}  # generation -> worker, keeps the signals object alive
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, **kwargs):
+        generation = next(self._counter)
+        self._current[channel] = generation
+        self._callbacks[generation] = (on_result, on_error)
+
+        worker = Worker(channel, generation, fn, args, kwargs)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.error.connect(self._on_error)
+        self._workers[generation] = worker
+        self.pool.start(worker)
+        return generation
+
+    def cancel(self, channel):
+        # A tarefa em andamento não é interrompida, apenas o resultado é descartado
+        self._current.pop(channel, None)
+
+    def is_current(self, channel, generation):
+        return self._current.get(channel) == generation
+
+    @Slot(str, int, object)
+    def _on_finished(self, channel, generation, result):
+        on_result, _ = self._release(generation)
+        if self.is_current(channel, generation) and on_result is not None:
+            on_result(result)
+
+    @Slot(str, int, str)
+    def _on_error(self, channel, generation, message):
+        _, on_error = self._release(generation)
+        if self.is_current(channel, generation) and on_error is not None:
+            on_error(message)
+
+    def _release(self, generation):
+        self._workers.pop(generation, None)
+        return self._callbacks.pop(generation, (None, None))